@@ -0,0 +1,33 @@
+"""Add keyset pagination indexes
+
+Revision ID: 3c9e5f1b2d47
+Revises: a7d532215a15
+Create Date: 2026-10-16 09:12:41.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c9e5f1b2d47'
+down_revision: Union[str, None] = 'a7d532215a15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # create_all() adds these on a fresh database, so skip any that already exist
+    op.create_index('ix_courses_created_at_id', 'courses', ['created_at', 'id'], unique=False, if_not_exists=True)
+    op.create_index('ix_enrollments_user_enrolled_at_id', 'enrollments', ['user_id', 'enrolled_at', 'id'], unique=False, if_not_exists=True)
+    op.create_index('ix_enrollments_course_enrolled_at_id', 'enrollments', ['course_id', 'enrolled_at', 'id'], unique=False, if_not_exists=True)
+    op.create_index('ix_comments_course_created_at_id', 'comments', ['course_id', 'created_at', 'id'], unique=False, if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_comments_course_created_at_id', table_name='comments', if_exists=True)
+    op.drop_index('ix_enrollments_course_enrolled_at_id', table_name='enrollments', if_exists=True)
+    op.drop_index('ix_enrollments_user_enrolled_at_id', table_name='enrollments', if_exists=True)
+    op.drop_index('ix_courses_created_at_id', table_name='courses', if_exists=True)
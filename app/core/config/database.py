@@ -1,3 +1,4 @@
+import logging
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
@@ -7,13 +8,22 @@ from app.core.config.env import get_settings
 
 
 
+logger = logging.getLogger(__name__)
+
 settings = get_settings()
 DATABASE_URL = settings.DATABASE_URL
-print(DATABASE_URL)
 
 
-# Create the SQLAlchemy engine
-engine = create_engine(DATABASE_URL)
+# Create the SQLAlchemy engine, shared by every session of the process.
+# pool_pre_ping replaces connections the server dropped while idle, and
+# pool_recycle retires them before Postgres or a proxy times them out.
+engine = create_engine(
+    DATABASE_URL,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_pre_ping=True,
+    pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+)
 
 # Session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -23,11 +33,24 @@ Base = declarative_base()
 
 
 
+def commit_without_expiring(session):
+    """
+    Commit, keeping the session's loaded objects usable afterwards.
+
+    SessionLocal expires everything on commit, so reading an object that was
+    just written would SELECT it again. Use this when the caller builds its
+    response from the objects it has just inserted.
+    """
+    expire_on_commit = session.expire_on_commit
+    session.expire_on_commit = False
+    try:
+        session.commit()
+    finally:
+        session.expire_on_commit = expire_on_commit
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
-        print("----database initialized")
-        
     finally:
         db.close()
\ No newline at end of file
@@ -1,6 +1,8 @@
+import logging
 from pydantic_settings import BaseSettings
 from functools import lru_cache
-from pprint import pprint
+
+logger = logging.getLogger(__name__)
 
 class Settings(BaseSettings):
     DATABASE_URL: str
@@ -31,13 +33,17 @@ class Settings(BaseSettings):
     BUNNY_CDN_PROFILE_STORAGE_ZONE: str
     BUNNY_CDN_PROFILE_STORAGE_APIKEY: str
 
+    DB_POOL_SIZE: int = 25
+    DB_MAX_OVERFLOW: int = 25
+    DB_POOL_RECYCLE_SECONDS: int = 1800
     
 
     class Config:
         env_file = ".env"  # Specify the .env file to load variables from
 
+@lru_cache(maxsize=1)
 def get_settings():
+    # Read the environment once; the values hold secrets, so they are not logged
     settings = Settings()
-    print("Loading settings from environment variables...")
-    pprint(settings.model_dump())
+    logger.info("Loaded settings from environment variables")
     return settings
@@ -1,7 +1,8 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Float, ARRAY
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Float, ARRAY, Index
 from sqlalchemy.sql import func
 from datetime import datetime, timezone
 from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.ext.hybrid import hybrid_property
 from app.core.config.database import Base
 import uuid
 from sqlalchemy.dialects.postgresql import UUID  # For PostgreSQL
@@ -42,6 +43,18 @@ class Course(Base):
     comments = relationship("Comment", back_populates="course", cascade="all, delete-orphan")
     reviews = relationship("Review", back_populates="course", cascade="all, delete-orphan")
 
+    # Supports keyset pagination on (created_at, id)
+    __table_args__ = (Index("ix_courses_created_at_id", "created_at", "id"),)
+
+    @hybrid_property
+    def net_price(self):
+        """Price after the percentage discount."""
+        return self.price - (self.price * (self.discount or 0) / 100)
+
+    @net_price.expression
+    def net_price(cls):
+        return cls.price - (cls.price * func.coalesce(cls.discount, 0) / 100)
+
 
 class Enrollment(Base):
     __tablename__ = "enrollments"
@@ -59,6 +72,12 @@ class Enrollment(Base):
     user = relationship("User", back_populates="enrollments")  # M:N (Student ↔ Courses)
     course = relationship("Course", back_populates="enrollments")  # M:N
 
+    # Support keyset pagination on (enrolled_at, id) per user and per course
+    __table_args__ = (
+        Index("ix_enrollments_user_enrolled_at_id", "user_id", "enrolled_at", "id"),
+        Index("ix_enrollments_course_enrolled_at_id", "course_id", "enrolled_at", "id"),
+    )
+
 class Lesson(Base):
     __tablename__ = "lessons"
     id: Mapped[UUID] = mapped_column(
@@ -146,6 +165,9 @@ class Comment(Base):
     user = relationship("User", back_populates="comments")
     course = relationship("Course", back_populates="comments")
 
+    # Supports keyset pagination of a course's comments on (created_at, id)
+    __table_args__ = (Index("ix_comments_course_created_at_id", "course_id", "created_at", "id"),)
+
 class Review(Base):
     __tablename__ = "reviews"
     id: Mapped[UUID] = mapped_column(
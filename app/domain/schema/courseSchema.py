@@ -26,7 +26,8 @@ class LessonInput(BaseModel):
     description: str = Field(..., min_length=1)
     duration: int = Field(..., gt=0)
     order: int = Field(default=None)
-    video: Optional[VideoInput] = Field(default=None)
+    # Stored in its own table; excluded so model_dump() yields just the lesson columns
+    video: Optional[VideoInput] = Field(default=None, exclude=True)
 
     model_config = {
         "json_schema_extra": {
@@ -89,7 +90,8 @@ class CourseInput(BaseModel):
     price: float = Field(..., ge=0)
     discount: Optional[float] = Field(default=None, description="Special offer price")
     instructor_id: UUID = Field(..., description="UUID of the instructor")
-    lessons: Optional[List[LessonInput]] = Field(default=None, description="List of lessons for the course")
+    # Created separately; excluded so model_dump() yields just the course columns
+    lessons: Optional[List[LessonInput]] = Field(default=None, description="List of lessons for the course", exclude=True)
 
     model_config = {
         "json_schema_extra": {
@@ -151,6 +153,24 @@ class CourseResponse(BaseModel):
         "from_attributes": True
     }
 
+class CourseListItemResponse(BaseModel):
+    """CourseResponse without lessons, for list endpoints."""
+    id: UUID
+    title: str
+    description: str
+    tags: Optional[List[str]]
+    price: float
+    discount: Optional[float] = None
+    thumbnail_url: Optional[str] = None
+    instructor_id: UUID
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    instructor: Optional[UserResponse] = Field(default=None)
+
+    model_config = {
+        "from_attributes": True
+    }
+
 class CourseAnalysisResponse(BaseModel):
     view_count: int
     no_of_enrollments: int
@@ -223,12 +243,29 @@ class SearchParams(PaginationParams):
         description="Filter term"
     )
 
+class CursorParams(BaseModel):
+    """Cursor pagination fields, mixed into the paginated query param models."""
+    cursor: Optional[str] = Field(
+        default=None,
+        description="Opaque cursor from a previous page; takes precedence over page"
+    )
+    include_total: bool = Field(
+        default=False,
+        description="Also count all matching items; ignored with a cursor"
+    )
+
+class CursorSearchParams(CursorParams, SearchParams):
+    pass
+
 class DateFilterParams(SearchParams):
     year: Optional[int] = None
     month: Optional[int] = None
     week: Optional[int] = None
     day: Optional[int] = None
 
+class CursorDateFilterParams(CursorParams, DateFilterParams):
+    pass
+
 
 class ModuleInput(BaseModel):
     title: str
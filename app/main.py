@@ -1,3 +1,5 @@
+import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.openapi.docs import get_swagger_ui_html
 from fastapi.openapi.utils import get_openapi
@@ -6,6 +8,8 @@ from sqlalchemy import text
 from app.router.routers import routers
 from app.core.config.database import Base, engine
 from app.core.config.env import get_settings
+from app.utils.helper import PydanticJSONResponse
+from app.utils.bunny.bunnyStorage import close_async_client, get_async_client, get_session
 
 sentry_sdk.init(
     dsn=get_settings().SENTRY_DNS,
@@ -20,7 +24,20 @@ sentry_sdk.init(
     profile_lifecycle="trace"
 )
 
-print("initializing app")
+# Debug logging from request paths is dropped unless explicitly enabled
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+logger.info("initializing app")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Build the shared CDN clients up front rather than inside the first upload
+    get_async_client()
+    get_session()
+    yield
+    await close_async_client()
+
 class AppCreator():
     def __init__(self):
         self.app = FastAPI(
@@ -30,7 +47,9 @@ class AppCreator():
             docs_url="/docs",
             redoc_url="/redoc",
             openapi_url="/openapi.json",
-            swagger_ui_parameters={"persistAuthorization": True}
+            swagger_ui_parameters={"persistAuthorization": True},
+            default_response_class=PydanticJSONResponse,
+            lifespan=lifespan
         )
 
         self.app.include_router(routers)
@@ -48,7 +67,7 @@ class AppCreator():
 try:
     Base.metadata.create_all(bind=engine)
 except Exception as e:
-    print("Error creating tables:", e)
+    logger.error("Error creating tables: %s", e)
 
 # Create the app instance
 app_creator = AppCreator()
@@ -2,7 +2,7 @@ from sqlalchemy.orm import Session, joinedload
 from app.domain.model.course import Comment, Review, Course
 from app.utils.exceptions.exceptions import NotFoundError, ValidationError
 from typing import Tuple, Optional, Any, List
-from sqlalchemy import func, or_
+from sqlalchemy import func, or_, tuple_
 from uuid import UUID
 
 def _wrap_return(result: Any) -> Tuple[Any, None]:
@@ -59,7 +59,7 @@ class CommentReviewRepository:
         """
         try:
             comment = (self.db.query(Comment)
-                .options(joinedload(Comment.user), joinedload(Comment.course))
+                .options(joinedload(Comment.user))
                 .filter(Comment.id == comment_id).first())
             if not comment:
                 return None, NotFoundError(detail="Comment not found")
@@ -67,29 +67,32 @@ class CommentReviewRepository:
         except Exception as e:
             return _wrap_error(e)
 
-    def get_comments_by_course(self, course_id: str, page: int = 1, page_size: int = 10) -> List[Comment]:
+    def get_comments_by_course(self, course_id: str, page: int = 1, page_size: int = 10, after: Optional[Tuple[Any, Any]] = None) -> List[Comment]:
         """
         Get all comments for a course with pagination.
 
+        Comments are ordered newest first. When `after` is given the page is
+        located with a keyset seek on (created_at, id) instead of OFFSET.
+        The caller is expected to have checked that the course exists.
+
         Args:
             course_id (str): The ID of the course.
             page (int, optional): The page number. Defaults to 1.
             page_size (int, optional): The number of items per page. Defaults to 10.
+            after (Optional[Tuple], optional): (created_at, id) of the last comment of the previous page. Defaults to None.
 
         Returns:
-            List[Comment]: A list of comment objects.
-
-        Raises:
-            NotFoundError: If the course is not found.
+            List[Comment]: Up to page_size + 1 comment objects.
         """
         try:
-            course = self.db.query(Course).filter(Course.id == course_id).first()
-            if not course:
-                return None, NotFoundError(detail="Course not found for comments")
-            comments = (self.db.query(Comment).options(joinedload(Comment.user))
+            query = (self.db.query(Comment).options(joinedload(Comment.user))
                 .filter(Comment.course_id == course_id)
-                .order_by(Comment.created_at.desc())
-                .offset((page - 1) * page_size).limit(page_size).all())
+                .order_by(Comment.created_at.desc(), Comment.id.desc()))
+            if after is not None:
+                query = query.filter(tuple_(Comment.created_at, Comment.id) < tuple_(*after))
+            else:
+                query = query.offset((page - 1) * page_size)
+            comments = query.limit(page_size + 1).all()
             return _wrap_return(comments)
         except Exception as e:
             return _wrap_error(e)
@@ -109,7 +112,7 @@ class CommentReviewRepository:
         try:
             comments = (
                 self.db.query(Comment)
-                .options(joinedload(Comment.course), joinedload(Comment.user))
+                .options(joinedload(Comment.user))
                 .filter(Comment.user_id == user_id)
                 .order_by(Comment.created_at.desc())
                 .offset((page - 1) * page_size)
@@ -249,7 +252,6 @@ class CommentReviewRepository:
         """
         try:
             review = (self.db.query(Review)
-                .options(joinedload(Review.user), joinedload(Review.course))
                 .filter(Review.id == review_id).first())
             if not review:
                 return None, NotFoundError(detail="Review not found")
@@ -276,7 +278,7 @@ class CommentReviewRepository:
             course = self.db.query(Course).filter(Course.id == course_id).first()
             if not course:
                 return None, NotFoundError(detail="Course not found")
-            reviews = (self.db.query(Review).options(joinedload(Review.user))
+            reviews = (self.db.query(Review)
                 .filter(Review.course_id == course_id)
                 .order_by(Review.created_at.desc())
                 .offset((page - 1) * page_size).limit(page_size).all())
@@ -299,7 +301,6 @@ class CommentReviewRepository:
         try:
             reviews = (
                 self.db.query(Review)
-                .options(joinedload(Review.course))
                 .filter(Review.user_id == user_id)
                 .order_by(Review.created_at.desc())
                 .offset((page - 1) * page_size)
@@ -1,17 +1,52 @@
-from sqlalchemy.orm import Session, joinedload
+from functools import cached_property
+from sqlalchemy.orm import Session, joinedload, selectinload, contains_eager, raiseload
 from app.domain.model.course import Course, Enrollment, Lesson, Video, Comment, Review, Payment
+from app.domain.model.user import User
 from app.domain.schema.courseSchema import CourseAnalysisResponse
 from app.utils.exceptions.exceptions import NotFoundError, ValidationError
-from sqlalchemy import or_, func
+from sqlalchemy import or_, func, tuple_, case, insert
 from typing import Tuple, Optional, Any, List
 from app.repository.payment_repo import PaymentRepository
 from app.repository.lesson_repo import LessonRepository
+from app.core.config.database import commit_without_expiring
+from app.utils.helper import as_uuid
+from app.utils.pydantic_cache import ta
 
 def _wrap_return(result: Any) -> Tuple[Any, None]:
     return result, None
 def _wrap_error(e: Exception) -> Tuple[None, Exception]:
     return None, e
 
+def _apply_date_filters(query, column, year=None, month=None, week=None, day=None):
+    """Narrow a query to rows whose `column` falls in the given date parts."""
+    if year is not None:
+        query = query.filter(func.extract('year', column) == year)
+    if month is not None:
+        query = query.filter(func.extract('month', column) == month)
+    if week is not None:
+        query = query.filter(func.extract('week', column) == week)
+    if day is not None:
+        query = query.filter(func.extract('day', column) == day)
+    return query
+
+# Columns returned by list endpoints; mirrors CourseListItemResponse
+COURSE_LIST_COLUMNS = (
+    Course.id, Course.title, Course.description, Course.tags, Course.price,
+    Course.discount, Course.thumbnail_url, Course.instructor_id,
+    Course.created_at, Course.updated_at,
+)
+# Mirrors UserResponse
+INSTRUCTOR_COLUMNS = (
+    User.id, User.first_name, User.last_name, User.phone_number, User.role,
+    User.is_active, User.profile_picture, User.created_at, User.updated_at,
+)
+# Mirrors EnrollmentResponse
+ENROLLMENT_COLUMNS = (
+    Enrollment.id, Enrollment.user_id, Enrollment.course_id, Enrollment.enrolled_at,
+)
+# Rows held in memory at a time when an unpaginated query is streamed
+STREAM_CHUNK_SIZE = 500
+
 class CourseRepository:
     """
     Repository class for handling course-related database operations.
@@ -25,8 +60,15 @@ class CourseRepository:
             db (Session): The database session.
         """
         self.db = db
-        self.payment_repo = PaymentRepository(db)
-        self.lesson_repo = LessonRepository(db)
+
+    # Only the revenue and lesson count helpers delegate to these
+    @cached_property
+    def payment_repo(self) -> PaymentRepository:
+        return PaymentRepository(self.db)
+
+    @cached_property
+    def lesson_repo(self) -> LessonRepository:
+        return LessonRepository(self.db)
 
     def create_course(self, course: Course):
         """
@@ -35,13 +77,16 @@ class CourseRepository:
         Args:
             course (Course): The course object to be created.
 
+        The INSERT fetches server-generated columns with RETURNING and the
+        commit keeps them loaded, so the course is not read back.
+
         Returns:
             Course: The created course object.
         """
         try:
             self.db.add(course)
-            self.db.commit()
-            self.db.refresh(course)
+            self.db.flush()
+            commit_without_expiring(self.db)
             return _wrap_return(course)
         except Exception as e:
             self.db.rollback()
@@ -51,6 +96,9 @@ class CourseRepository:
         """
         Get a course with its lessons and instructor.
 
+        Lessons and their videos are loaded with one IN query each, so
+        serializing the course never lazy-loads per lesson.
+
         Args:
             course_id (str): The ID of the course.
 
@@ -64,7 +112,7 @@ class CourseRepository:
             course = (
                 self.db.query(Course)
                 .options(
-                    joinedload(Course.lessons),
+                    selectinload(Course.lessons).selectinload(Lesson.video),
                     joinedload(Course.instructor)
                 )
                 .filter(Course.id == course_id)
@@ -72,43 +120,133 @@ class CourseRepository:
             )
             if not course:
                 return None, NotFoundError(detail="Course not found")
-            if course.discount and course.discount>0:
-                course.price = course.price - (course.price * course.discount / 100)
             return _wrap_return(course)
         except Exception as e:
             return _wrap_error(e)
 
+    def get_course_with_enrollment_flag(self, course_id: str, user_id: str):
+        """
+        Get a course with its lessons and instructor, and whether a user is enrolled.
+
+        The enrollment check is an EXISTS column on the course query, so a
+        course page for a signed-in user costs no extra round trip.
+
+        Args:
+            course_id (str): The ID of the course.
+            user_id (str): The ID of the user.
+
+        Returns:
+            Tuple[Course, bool]: The course with lessons and instructor loaded, and the enrollment flag.
+
+        Raises:
+            NotFoundError: If the course is not found.
+        """
+        try:
+            is_enrolled = (self.db.query(Enrollment)
+                .filter(Enrollment.user_id == user_id)
+                .filter(Enrollment.course_id == Course.id)
+                .exists())
+            row = (
+                self.db.query(Course, is_enrolled.label("is_enrolled"))
+                .options(
+                    selectinload(Course.lessons).selectinload(Lesson.video),
+                    joinedload(Course.instructor),
+                    raiseload('*')
+                )
+                .filter(Course.id == course_id)
+                .first()
+            )
+            if not row:
+                return None, NotFoundError(detail="Course not found")
+            course, enrolled = row
+            return _wrap_return((course, bool(enrolled)))
+        except Exception as e:
+            return _wrap_error(e)
+
+    def get_auth_context(self, user_id: str, course_id: str):
+        """
+        Get what an admin-or-owner check needs about a user and a course in one query.
+
+        Args:
+            user_id (str): The ID of the user.
+            course_id (str): The ID of the course.
+
+        Returns:
+            Tuple[str, bool, Optional[UUID]]: The user's role, whether the course
+            exists, and its instructor ID; None if the user is not found.
+        """
+        try:
+            course_exists = self.db.query(Course).filter(Course.id == course_id).exists()
+            instructor_id = (
+                self.db.query(Course.instructor_id)
+                .filter(Course.id == course_id)
+                .scalar_subquery()
+            )
+            row = (
+                self.db.query(User.role, course_exists, instructor_id)
+                .filter(User.id == user_id)
+                .first()
+            )
+            if not row:
+                return None, None
+            role, found, instructor = row
+            return _wrap_return((role, bool(found), instructor))
+        except Exception as e:
+            return _wrap_error(e)
+
     def get_course(self, course_id: str):
         """
-        Get a course by its ID.
+        Get a course by its ID, without loading any relationships.
+
+        Use get_course_with_lessons when the course will be serialized.
+        A course already loaded in this session is returned without a query.
 
         Args:
             course_id (str): The ID of the course.
 
         Returns:
-            Course: The course object with lessons and instructor loaded.
+            Course: The course object.
+
+        Raises:
+            NotFoundError: If the course is not found.
         """
-        return self.get_course_with_lessons(course_id)
+        try:
+            course = self.db.get(Course, as_uuid(course_id))
+            if not course:
+                return None, NotFoundError(detail="Course not found")
+            return _wrap_return(course)
+        except Exception as e:
+            return _wrap_error(e)
 
-    def get_courses(self, page: int = 1, page_size: int = 10, search: Optional[str] = None, filter: Optional[str] = None):
+    def get_courses(self, page: int = 1, page_size: int = 10, search: Optional[str] = None, filter: Optional[str] = None, after: Optional[Tuple[Any, Any]] = None, user_id: Optional[str] = None, with_total: bool = False):
         """
         Get all courses with pagination, search, and filter options.
 
+        Courses are ordered newest first. When `after` is given the page is
+        located with a keyset seek on (created_at, id) instead of OFFSET.
+
         Args:
             page (int, optional): The page number. Defaults to 1.
             page_size (int, optional): The number of items per page. Defaults to 10.
             search (Optional[str], optional): Search term for course title, description, or tags. Defaults to None.
             filter (Optional[str], optional): Filter term for course tags. Defaults to None.
+            after (Optional[Tuple], optional): (created_at, id) of the last course of the previous page. Defaults to None.
+            user_id (Optional[str], optional): When given, each course also gets an `is_enrolled` flag for this user. Defaults to None.
+            with_total (bool, optional): Also count every matching course in the same query. Defaults to False.
 
         Returns:
-            List[Course]: A list of course objects.
+            Tuple[List[dict], Optional[int]]: Up to page_size + 1 course column mappings, each with its
+                `instructor` mapping, and the total when requested and the page is not empty.
         """
-        query = (
-            self.db.query(Course)
-            .options(
-                joinedload(Course.instructor)  # Only load instructor relationship
-            )
-        )
+        # Project plain columns; list views never need lessons or ORM state
+        query = self.db.query(*COURSE_LIST_COLUMNS)
+        if user_id:
+            # Correlated EXISTS per course row, answered from the enrollments index
+            is_enrolled = (self.db.query(Enrollment)
+                .filter(Enrollment.user_id == user_id)
+                .filter(Enrollment.course_id == Course.id)
+                .exists())
+            query = query.add_columns(is_enrolled.label("is_enrolled"))
 
         if search:
             # Fuzzy search using ILIKE for case-insensitive matching
@@ -124,22 +262,45 @@ class CourseRepository:
         if filter:
             query = query.filter(func.array_to_string(Course.tags, ' ').ilike(f"%{filter}%"))
 
+        query = query.order_by(Course.created_at.desc(), Course.id.desc())
+        if with_total:
+            # window functions run before LIMIT/OFFSET, so this counts every match
+            query = query.add_columns(func.count().over().label("total"))
+
         try:
-            results = (query
-                .offset((page - 1) * page_size)
-                .limit(page_size)
-                .all())
-            return _wrap_return(results)
+            if after is not None:
+                query = query.filter(tuple_(Course.created_at, Course.id) < tuple_(*after))
+            else:
+                query = query.offset((page - 1) * page_size)
+            courses = [dict(row._mapping) for row in query.limit(page_size + 1).all()]
+            total = courses[0]["total"] if with_total and courses else None
+            if with_total:
+                for course in courses:
+                    del course["total"]
+
+            instructor_ids = {course["instructor_id"] for course in courses if course["instructor_id"]}
+            instructors = {}
+            if instructor_ids:
+                rows = self.db.query(*INSTRUCTOR_COLUMNS).filter(User.id.in_(instructor_ids)).all()
+                instructors = {row.id: dict(row._mapping) for row in rows}
+            for course in courses:
+                course["instructor"] = instructors.get(course["instructor_id"])
+            return _wrap_return((courses, total))
         except Exception as e:
             return _wrap_error(e)
 
-    def enroll_course(self, user_id: str, course_id: str):
+    def enroll_course(self, user_id: str, course_id: str, check_course: bool = True):
         """
         Enroll a user in a course.
 
+        The enrollment is written with INSERT ... RETURNING, so its server-set
+        columns come back without a refresh.
+
         Args:
             user_id (str): The ID of the user.
             course_id (str): The ID of the course.
+            check_course (bool): Whether to check the course exists first;
+                callers that have just loaded it can skip this.
 
         Returns:
             Enrollment: The created enrollment object.
@@ -148,35 +309,53 @@ class CourseRepository:
             NotFoundError: If the course is not found.
         """
         try:
-            course = self.db.query(Course).filter(Course.id == course_id).first()
-            if not course:
-                return None, NotFoundError(detail="Course not found")
-            
-            enrollment = Enrollment(user_id=user_id, course_id=course_id)
-            self.db.add(enrollment)
-            self.db.commit()
-            self.db.refresh(enrollment)
+            if check_course:
+                course_exists = self.db.query(
+                    self.db.query(Course).filter(Course.id == course_id).exists()
+                ).scalar()
+                if not course_exists:
+                    return None, NotFoundError(detail="Course not found")
+
+            enrollment = self.db.scalars(
+                insert(Enrollment).values(user_id=user_id, course_id=course_id).returning(Enrollment)
+            ).one()
+            commit_without_expiring(self.db)
             return _wrap_return(enrollment)
         except Exception as e:
             self.db.rollback()
             return _wrap_error(e)
 
-    def get_enrolled_courses(self, user_id: str, page: int = 1, page_size: int = 10, search: Optional[str] = None):
+    def get_enrolled_courses(self, user_id: str, page: int = 1, page_size: int = 10, search: Optional[str] = None, after: Optional[Tuple[Any, Any]] = None, with_total: bool = False):
         """
         Get all courses enrolled by a user with pagination and search options.
 
+        Enrollments are ordered most recent first. When `after` is given the page
+        is located with a keyset seek on (enrolled_at, id) instead of OFFSET.
+        Each course and its instructor come back in the same SELECT, so the
+        page is a single query whatever its size. Every other relationship is
+        set to raise on access, so a lazy load added later fails loudly instead
+        of quietly issuing one query per row.
+
         Args:
             user_id (str): The ID of the user.
             page (int, optional): The page number. Defaults to 1.
             page_size (int, optional): The number of items per page. Defaults to 10.
             search (Optional[str], optional): Search term for course title or description. Defaults to None.
+            after (Optional[Tuple], optional): (enrolled_at, id) of the last enrollment of the previous page. Defaults to None.
+            with_total (bool, optional): Also count all of the user's matching enrollments in the same query. Defaults to False.
 
         Returns:
-            List[Enrollment]: A list of enrollment objects with associated courses.
+            Tuple[List[Enrollment], Optional[int]]: Up to page_size + 1 enrollment objects with associated
+                courses, and the total when requested and the page is not empty.
         """
         query = (
             self.db.query(Enrollment)
-            .options(joinedload(Enrollment.course))
+            .join(Enrollment.course)
+            .options(
+                contains_eager(Enrollment.course).joinedload(Course.instructor),
+                contains_eager(Enrollment.course).raiseload('*'),
+                raiseload('*')
+            )
             .filter(Enrollment.user_id == user_id)
         )
 
@@ -189,12 +368,20 @@ class CourseRepository:
                 )
             )
 
+        query = query.order_by(Enrollment.enrolled_at.desc(), Enrollment.id.desc())
+        if with_total:
+            query = query.add_columns(func.count().over().label("total"))
+
         try:
-            items = (query
-                .offset((page - 1) * page_size)
-                .limit(page_size)
-                .all())
-            return _wrap_return(items)
+            if after is not None:
+                query = query.filter(tuple_(Enrollment.enrolled_at, Enrollment.id) < tuple_(*after))
+            else:
+                query = query.offset((page - 1) * page_size)
+            items = query.limit(page_size + 1).all()
+            if not with_total:
+                return _wrap_return((items, None))
+            total = items[0].total if items else None
+            return _wrap_return(([row[0] for row in items], total))
         except Exception as e:
             return _wrap_error(e)
 
@@ -207,29 +394,48 @@ class CourseRepository:
         day: Optional[int]    = None,
         page: Optional[int]   = None,
         page_size: Optional[int] = None,
+        after: Optional[Tuple[Any, Any]] = None,
+        with_total: bool = False,
     ):
         """
         Get enrollments for a course, filtered by date on `Enrollment.created_at`,
         and optionally paginated only if page & page_size are provided.
+
+        Enrollments are ordered most recent first. When `after` is given the page
+        is located with a keyset seek on (enrolled_at, id) instead of OFFSET.
+
+        Without pagination a column-only query (ENROLLMENT_COLUMNS) is returned
+        unexecuted with yield_per set, so iterating it fetches STREAM_CHUNK_SIZE
+        rows at a time instead of loading every enrollment of the course at once.
+
+        Returns `(enrollments, total)`, with up to page_size + 1 enrollments when
+        paginating; with `with_total` on a page-numbered request the total is
+        counted in the same query with a window function.
         """
-        query = (
+        query = _apply_date_filters(
             self.db.query(Enrollment)
-            .filter(Enrollment.course_id == course_id)
-        )
-        if year is not None:
-            query = query.filter(func.extract('year', Enrollment.enrolled_at) == year)
-        if month is not None:
-            query = query.filter(func.extract('month', Enrollment.enrolled_at) == month)
-        if week is not None:
-            query = query.filter(func.extract('week', Enrollment.enrolled_at) == week)
-        if day is not None:
-            query = query.filter(func.extract('day', Enrollment.enrolled_at) == day)
+            .filter(Enrollment.course_id == course_id),
+            Enrollment.enrolled_at, year, month, week, day
+        ).order_by(Enrollment.enrolled_at.desc(), Enrollment.id.desc())
 
         try:
-            if page is not None and page_size is not None:
-                query = query.offset((page - 1) * page_size).limit(page_size)
+            if after is not None:
+                query = query.filter(tuple_(Enrollment.enrolled_at, Enrollment.id) < tuple_(*after))
+                if page_size is not None:
+                    query = query.limit(page_size + 1)
+            elif page is not None and page_size is not None:
+                if with_total:
+                    query = query.add_columns(func.count().over().label("total"))
+                query = query.offset((page - 1) * page_size).limit(page_size + 1)
+            else:
+                # plain column rows: no ORM identity map or instance state per row
+                rows = query.with_entities(*ENROLLMENT_COLUMNS).yield_per(STREAM_CHUNK_SIZE)
+                return _wrap_return((rows, None))
             results = query.all()
-            return _wrap_return(results)
+            if after is not None or not with_total:
+                return _wrap_return((results, None))
+            total = results[0].total if results else None
+            return _wrap_return(([row[0] for row in results], total))
         except Exception as e:
             return _wrap_error(e)
 
@@ -258,6 +464,85 @@ class CourseRepository:
         except Exception as e:
             return _wrap_error(e)
 
+    def get_course_checkout(self, course_id: str, user_id: str):
+        """
+        Get what enrollment needs about a course in a single query.
+
+        Args:
+            course_id (str): The ID of the course.
+            user_id (str): The ID of the user enrolling.
+
+        Returns:
+            Row: `(title, net_price, is_enrolled)` for the course, None if not found.
+        """
+        try:
+            is_enrolled = (self.db.query(Enrollment)
+                .filter(Enrollment.user_id == user_id)
+                .filter(Enrollment.course_id == Course.id)
+                .exists())
+            row = (self.db.query(
+                    Course.title,
+                    Course.net_price.label("net_price"),
+                    is_enrolled.label("is_enrolled"))
+                .filter(Course.id == course_id)
+                .first())
+            return _wrap_return(row)
+        except Exception as e:
+            return _wrap_error(e)
+
+    def enrollment_exists(self, user_id: str, course_id: str):
+        """
+        Check whether a user is enrolled in a course without loading the row.
+
+        Args:
+            user_id (str): The ID of the user.
+            course_id (str): The ID of the course.
+
+        Returns:
+            bool: True if an enrollment exists, False otherwise.
+        """
+        try:
+            exists_query = (self.db.query(Enrollment)
+                .filter(Enrollment.user_id == user_id)
+                .filter(Enrollment.course_id == course_id)
+                .exists())
+            return _wrap_return(bool(self.db.query(exists_query).scalar()))
+        except Exception as e:
+            return _wrap_error(e)
+
+    def get_lesson_access(self, course_id: str, user_id: str):
+        """
+        Get everything needed to authorize lesson access in a single query.
+
+        Each check is wrapped in a CASE on the role, so Postgres only runs the
+        enrollment lookup for students and the ownership lookup for instructors.
+
+        Args:
+            course_id (str): The ID of the course.
+            user_id (str): The ID of the user.
+
+        Returns:
+            Row: `(role, is_enrolled, owns_course)` for the user, None if the user is not found.
+        """
+        try:
+            is_enrolled = (self.db.query(Enrollment)
+                .filter(Enrollment.user_id == User.id)
+                .filter(Enrollment.course_id == course_id)
+                .exists())
+            owns_course = (self.db.query(Course)
+                .filter(Course.id == course_id)
+                .filter(Course.instructor_id == User.id)
+                .exists())
+            row = (self.db.query(
+                    User.role,
+                    case((User.role.in_(("admin", "instructor")), False), else_=is_enrolled).label("is_enrolled"),
+                    case((User.role == "instructor", owns_course), else_=False).label("owns_course"))
+                .filter(User.id == user_id)
+                .first())
+            return _wrap_return(row)
+        except Exception as e:
+            return _wrap_error(e)
+
     def get_enrolled_users_count(self, course_id: str) -> int:
         """
         Get the count of users enrolled in a course.
@@ -269,31 +554,40 @@ class CourseRepository:
             int: The number of enrolled users.
         """
         try:
-            count = self.db.query(Enrollment).filter(Enrollment.course_id == course_id).count()
+            count = self.db.query(func.count(Enrollment.id)).filter(Enrollment.course_id == course_id).scalar()
             return _wrap_return(count)
         except Exception as e:
             return _wrap_error(e)
 
-    def get_courses_by_instructor(self, instructor_id: str):
+    def get_courses_by_valid_instructor(self, instructor_id: str):
         """
-        Get all courses by an instructor with course analysis.
+        Get all courses by an instructor with course analysis, checking the
+        instructor's role in the same query.
 
         Args:
             instructor_id (str): The ID of the instructor.
 
         Returns:
-            List[CourseAnalysisResponse]: A list of course analysis responses.
+            List[CourseAnalysisResponse]: A list of course analysis responses,
+            or None if the user does not exist or is not an instructor.
         """
         try:
-            courses = self.db.query(Course).filter(Course.instructor_id == instructor_id).all()
-            analyses = []
-            for c in courses:
-                # Call without date filters for backward compatibility
-                analysis, err = self.course_analysis(c.id)
-                if err:
-                    return None, err
-                analyses.append(analysis)
-            return _wrap_return(analyses)
+            rows = (self._analysis_query()
+                .join(User, User.id == Course.instructor_id)
+                .filter(User.id == instructor_id)
+                .filter(User.role == "instructor")
+                .all())
+            if not rows:
+                # No rows: tell an instructor without courses from an invalid ID
+                is_instructor = self.db.query(
+                    self.db.query(User)
+                    .filter(User.id == instructor_id)
+                    .filter(User.role == "instructor")
+                    .exists()
+                ).scalar()
+                if not is_instructor:
+                    return None, None
+            return _wrap_return(self._analyses_from_rows(rows))
         except Exception as e:
             return _wrap_error(e)
 
@@ -319,46 +613,72 @@ class CourseRepository:
             NotFoundError: If the course is not found.
         """
         try:
-            course = self.db.query(Course).filter(Course.id == course_id).first()
-            if not course:
+            row = (self._analysis_query(year, month, week, day)
+                .filter(Course.id == course_id)
+                .first())
+            if not row:
                 return None, NotFoundError(detail="Course not found")
-            lessons_count, err = self.get_lessons_count(course_id)
-            if err:
-                return None, err
-
-            # Get enrollment count with date filtering
-            enrolled_count, err = self.get_enrolled_users_count_with_date_filter(
-                course_id=course_id,
-                year=year,
-                month=month,
-                week=week,
-                day=day
-            )
-            if err:
-                return None, err
-
-            for lesson in course.lessons:
-                lesson.video = None
-
-            # Get revenue with date filtering
-            revenue, err = self.get_course_revenue_with_date_filter(
-                course_id=course_id,
-                year=year,
-                month=month,
-                week=week,
-                day=day
-            )
-            if err:
-                return None, err
-
-            analysis = CourseAnalysisResponse(
-                course=course, view_count=course.view_count,
-                no_of_enrollments=enrolled_count, no_of_lessons=lessons_count,
-                revenue=revenue)
-            return _wrap_return(analysis)
+            return _wrap_return(self._analysis_from_row(row))
         except Exception as e:
             return _wrap_error(e)
 
+    def _analysis_query(
+        self,
+        year: Optional[int] = None,
+        month: Optional[int] = None,
+        week: Optional[int] = None,
+        day: Optional[int] = None
+    ):
+        """
+        Build a query of courses with their analysis figures.
+
+        Every figure is a correlated subquery, so analysing any number of
+        courses is one SELECT, plus one IN query for their lessons.
+        """
+        lessons_count = (self.db.query(func.count(Lesson.id))
+            .filter(Lesson.course_id == Course.id)
+            .scalar_subquery())
+        enrolled_count = _apply_date_filters(
+            self.db.query(func.count(Enrollment.id))
+            .filter(Enrollment.course_id == Course.id),
+            Enrollment.enrolled_at, year, month, week, day
+        ).scalar_subquery()
+        revenue = _apply_date_filters(
+            self.db.query(func.coalesce(func.sum(Payment.amount), 0.0))
+            .filter(Payment.course_id == Course.id)
+            .filter(Payment.status == "success"),
+            Payment.updated_at, year, month, week, day
+        ).scalar_subquery()
+
+        return (self.db.query(
+                Course,
+                lessons_count.label("lessons_count"),
+                enrolled_count.label("enrolled_count"),
+                revenue.label("revenue"))
+            .options(
+                # videos are not part of the analysis response
+                selectinload(Course.lessons).noload(Lesson.video),
+                joinedload(Course.instructor),
+                raiseload('*')
+            ))
+
+    @staticmethod
+    def _analysis_data(row) -> dict:
+        course = row.Course
+        return dict(
+            course=course, view_count=course.view_count,
+            no_of_enrollments=row.enrolled_count, no_of_lessons=row.lessons_count,
+            revenue=row.revenue)
+
+    @classmethod
+    def _analysis_from_row(cls, row) -> CourseAnalysisResponse:
+        return CourseAnalysisResponse(**cls._analysis_data(row))
+
+    @classmethod
+    def _analyses_from_rows(cls, rows) -> List[CourseAnalysisResponse]:
+        # one validator call for the whole list instead of one per course
+        return ta(List[CourseAnalysisResponse]).validate_python([cls._analysis_data(row) for row in rows])
+
     def get_total_courses_count(self, search: Optional[str] = None, filter_tag: Optional[str] = None):
         """
         Get the total count of courses with search and filter options.
@@ -371,9 +691,7 @@ class CourseRepository:
             int: The total number of courses matching the criteria.
         """
         try:
-            query = (
-                self.db.query(Course)
-                .options(joinedload(Course.instructor))            )
+            query = self.db.query(func.count(Course.id))
             if search:
                 search_term = f"%{search}%"
                 query = query.filter(
@@ -386,7 +704,7 @@ class CourseRepository:
             if filter_tag:
                 query = query.filter(func.array_to_string(Course.tags, ' ').ilike(f"%{filter_tag}%"))
 
-            count = query.count()
+            count = query.scalar()
             return _wrap_return(count)
         except Exception as e:
             return _wrap_error(e)
@@ -402,7 +720,7 @@ class CourseRepository:
             int: The total number of enrolled users.
         """
         try:
-            count = self.db.query(Enrollment).filter(Enrollment.course_id == course_id).count()
+            count = self.db.query(func.count(Enrollment.id)).filter(Enrollment.course_id == course_id).scalar()
             return _wrap_return(count)
         except Exception as e:
             return _wrap_error(e)
@@ -419,7 +737,7 @@ class CourseRepository:
             int: The number of courses enrolled by the user matching the criteria.
         """
         try:
-            count = self.db.query(Enrollment).filter(Enrollment.user_id == user_id).count()
+            count = self.db.query(func.count(Enrollment.id)).filter(Enrollment.user_id == user_id).scalar()
             return _wrap_return(count)
         except Exception as e:
             return _wrap_error(e)
@@ -458,7 +776,7 @@ class CourseRepository:
         Get enrollment count with date filtering.
         """
         try:
-            query = self.db.query(Enrollment).filter(Enrollment.course_id == course_id)
+            query = self.db.query(func.count(Enrollment.id)).filter(Enrollment.course_id == course_id)
 
             # Apply date filters on enrolled_at field
             if year is not None:
@@ -470,7 +788,7 @@ class CourseRepository:
             if day is not None:
                 query = query.filter(func.extract('day', Enrollment.enrolled_at) == day)
 
-            count = query.count()
+            count = query.scalar()
             return _wrap_return(count)
         except Exception as e:
             return _wrap_error(e)
@@ -497,18 +815,30 @@ class CourseRepository:
         """
         Update a course in the database.
 
+        The course is loaded with its lessons and instructor up front and kept
+        loaded through the commit, so callers can serialize the result without
+        reading the course back; only server-set columns are refreshed.
+
         Args:
             course_id (str): The ID of the course to update.
             course_data (dict): Dictionary containing the fields to update.
 
         Returns:
-            Course: The updated course object.
+            Course: The updated course, loaded like get_course_with_lessons.
 
         Raises:
             NotFoundError: If the course is not found.
         """
         try:
-            course = self.db.query(Course).filter(Course.id == course_id).first()
+            course = (
+                self.db.query(Course)
+                .options(
+                    selectinload(Course.lessons).selectinload(Lesson.video),
+                    joinedload(Course.instructor)
+                )
+                .filter(Course.id == course_id)
+                .first()
+            )
             if not course:
                 return None, NotFoundError(detail="Course not found")
 
@@ -517,8 +847,11 @@ class CourseRepository:
                 if hasattr(course, key) and value is not None:
                     setattr(course, key, value)
 
-            self.db.commit()
-            self.db.refresh(course)
+            commit_without_expiring(self.db)
+            refreshed = ["updated_at"]
+            if course_data.get("instructor_id") is not None:
+                refreshed.append("instructor")
+            self.db.refresh(course, attribute_names=refreshed)
             return _wrap_return(course)
         except Exception as e:
             self.db.rollback()
@@ -582,10 +915,8 @@ class CourseRepository:
             Tuple[List[CourseAnalysisResponse], Exception]: List of course analytics or error
         """
         try:
-            query = (
-                self.db.query(Course)
-                .options(joinedload(Course.instructor))
-            )
+            # figures are unfiltered; the date parts below select which courses are listed
+            query = self._analysis_query()
 
             # Apply date filters on updated_at field
             if year is not None:
@@ -614,18 +945,7 @@ class CourseRepository:
             if page is not None and page_size is not None:
                 query = query.offset((page - 1) * page_size).limit(page_size)
 
-            courses = query.all()
-
-            # Generate analytics for each course
-            analytics_list = []
-            for course in courses:
-                # Call without date filters since this method handles its own date filtering
-                analysis, err = self.course_analysis(course.id)
-                if err:
-                    return None, err
-                analytics_list.append(analysis)
-
-            return _wrap_return(analytics_list)
+            return _wrap_return(self._analyses_from_rows(query.all()))
         except Exception as e:
             return _wrap_error(e)
 
@@ -655,9 +975,9 @@ class CourseRepository:
             Tuple[List[CourseAnalysisResponse], Exception]: List of course analytics or error
         """
         try:
+            # figures are unfiltered; the date parts below select which courses are listed
             query = (
-                self.db.query(Course)
-                .options(joinedload(Course.instructor))
+                self._analysis_query()
                 .filter(Course.instructor_id == instructor_id)
             )
 
@@ -688,18 +1008,7 @@ class CourseRepository:
             if page is not None and page_size is not None:
                 query = query.offset((page - 1) * page_size).limit(page_size)
 
-            courses = query.all()
-
-            # Generate analytics for each course
-            analytics_list = []
-            for course in courses:
-                # Call without date filters since this method handles its own date filtering
-                analysis, err = self.course_analysis(course.id)
-                if err:
-                    return None, err
-                analytics_list.append(analysis)
-
-            return _wrap_return(analytics_list)
+            return _wrap_return(self._analyses_from_rows(query.all()))
         except Exception as e:
             return _wrap_error(e)
 
@@ -716,7 +1025,7 @@ class CourseRepository:
         Get total count of courses for admin analytics with filters.
         """
         try:
-            query = self.db.query(Course)
+            query = self.db.query(func.count(Course.id))
 
             # Apply date filters on updated_at field
             if year is not None:
@@ -741,7 +1050,7 @@ class CourseRepository:
             if filter:
                 query = query.filter(func.array_to_string(Course.tags, ' ').ilike(f"%{filter}%"))
 
-            count = query.count()
+            count = query.scalar()
             return _wrap_return(count)
         except Exception as e:
             return _wrap_error(e)
@@ -761,7 +1070,7 @@ class CourseRepository:
         """
         try:
             query = (
-                self.db.query(Course)
+                self.db.query(func.count(Course.id))
                 .filter(Course.instructor_id == instructor_id)
             )
 
@@ -788,7 +1097,7 @@ class CourseRepository:
             if filter:
                 query = query.filter(func.array_to_string(Course.tags, ' ').ilike(f"%{filter}%"))
 
-            count = query.count()
+            count = query.scalar()
             return _wrap_return(count)
         except Exception as e:
             return _wrap_error(e)
@@ -799,10 +1108,16 @@ class CourseRepository:
         """
         from datetime import datetime, timezone, timedelta
         # build query joining Enrollment to Course and filtering by instructor
+        # reuse the Course join for loading, and batch-load what CourseResponse reads
         query = (
             self.db.query(Enrollment)
             .join(Course, Enrollment.course)
-            .options(joinedload(Enrollment.user), joinedload(Enrollment.course))
+            .options(
+                joinedload(Enrollment.user),
+                contains_eager(Enrollment.course).joinedload(Course.instructor),
+                contains_eager(Enrollment.course).selectinload(Course.lessons).selectinload(Lesson.video),
+                raiseload('*')
+            )
             .filter(Course.instructor_id == instructor_id)
         )
         # calculate cutoff timestamp
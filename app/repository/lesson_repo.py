@@ -1,6 +1,10 @@
-from sqlalchemy.orm import Session, joinedload
-from app.domain.model.course import Lesson, Video, Course
+from sqlalchemy import insert, update, delete, func, inspect
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+from app.domain.model.course import Lesson, Video, Course, Enrollment
+from app.domain.model.user import User
 from app.utils.exceptions.exceptions import NotFoundError
+from app.core.config.database import commit_without_expiring
 from typing import List, Tuple, Optional, Any
 
 def _wrap_return(result: Any) -> Tuple[Any, None]:
@@ -8,38 +12,56 @@ def _wrap_return(result: Any) -> Tuple[Any, None]:
 def _wrap_error(e: Exception) -> Tuple[None, Exception]:
     return None, e
 
+def _column_values(model, data: dict) -> dict:
+    # UPDATE ... VALUES only takes columns, not relationships
+    columns = inspect(model).column_attrs.keys()
+    return {key: value for key, value in data.items() if key in columns}
+
 class LessonRepository:
     def __init__(self, db: Session):
         self.db = db
 
-    def get_lessons(self, course_id: str, page: int = 1, page_size: int = 10):
+    def get_lessons(self, course_id: str, page: int = 1, page_size: int = 10, with_total: bool = False):
         """
         Retrieve all lessons for a given course.
 
+        With `with_total` the course's lesson count comes back from the same
+        query as a window function. The course is only looked up separately
+        when the page is empty.
+
         Args:
             course_id (str): The ID of the course.
             page (int, optional): The page number for pagination. Defaults to 1.
             page_size (int, optional): The number of lessons per page. Defaults to 10.
+            with_total (bool, optional): Also count all of the course's lessons. Defaults to False.
 
         Returns:
-            List[Lesson]: A list of lessons for the specified course.
+            Tuple[List[Lesson], Optional[int]]: The lessons of the page and the total when
+                requested and the page is not empty; None if the course is not found.
 
         Raises:
             NotFoundError: If the course is not found.
         """
         try:
-            course = self.db.query(Course).filter(Course.id == course_id).first()
-            if not course:
-                return None, None
-            lessons = (
+            query = (
                 self.db.query(Lesson)
+                .options(selectinload(Lesson.video))
                 .filter(Lesson.course_id == course_id)
                 .order_by(Lesson.order.asc())
-                .offset((page - 1) * page_size)
-                .limit(page_size)
-                .all()
             )
-            return _wrap_return(lessons)
+            if with_total:
+                query = query.add_columns(func.count().over().label("total"))
+            rows = query.offset((page - 1) * page_size).limit(page_size).all()
+            if not rows:
+                course_exists = self.db.query(
+                    self.db.query(Course).filter(Course.id == course_id).exists()
+                ).scalar()
+                if not course_exists:
+                    return None, None
+                return _wrap_return(([], None))
+            if not with_total:
+                return _wrap_return((rows, None))
+            return _wrap_return(([row[0] for row in rows], rows[0].total))
         except Exception as e:
             return _wrap_error(e)
 
@@ -52,7 +74,7 @@ class LessonRepository:
             lesson_id (str): The lesson ID.
 
         Returns:
-            Lesson: The lesson object.
+            Lesson: The lesson object, with its video loaded.
 
         Raises:
             NotFoundError: If the lesson is not found.
@@ -60,6 +82,7 @@ class LessonRepository:
         try:
             lesson = (
                 self.db.query(Lesson)
+                .options(joinedload(Lesson.video))
                 .filter(Lesson.course_id == course_id)
                 .filter(Lesson.id == lesson_id)
                 .first()
@@ -70,28 +93,92 @@ class LessonRepository:
         except Exception as e:
             return _wrap_error(e)
 
-    def add_multiple_lessons(self, course_id: str, lessons: List[Lesson]):
+    def get_lesson_with_access(self, course_id: str, lesson_id: str, user_id: str):
+        """
+        Get a lesson together with what is needed to authorize a user for it.
+
+        The role, enrollment and ownership checks are subqueries on the lesson
+        query, so fetching and authorizing a lesson is a single round trip.
+
+        Args:
+            course_id (str): The course ID.
+            lesson_id (str): The lesson ID.
+            user_id (str): The ID of the user requesting the lesson.
+
+        Returns:
+            Tuple[Lesson, Row]: The lesson with its video loaded and a
+            `(role, is_enrolled, owns_course)` row whose role is None if the
+            user is not found; None if the lesson is not found.
+        """
+        try:
+            role = (self.db.query(User.role)
+                .filter(User.id == user_id)
+                .scalar_subquery())
+            is_enrolled = (self.db.query(Enrollment)
+                .filter(Enrollment.user_id == user_id)
+                .filter(Enrollment.course_id == course_id)
+                .exists())
+            owns_course = (self.db.query(Course)
+                .filter(Course.id == course_id)
+                .filter(Course.instructor_id == user_id)
+                .exists())
+            row = (
+                self.db.query(
+                    Lesson,
+                    role.label("role"),
+                    is_enrolled.label("is_enrolled"),
+                    owns_course.label("owns_course"))
+                .options(joinedload(Lesson.video))
+                .filter(Lesson.course_id == course_id)
+                .filter(Lesson.id == lesson_id)
+                .first()
+            )
+            if not row:
+                return None, None
+            return _wrap_return((row.Lesson, row))
+        except Exception as e:
+            return _wrap_error(e)
+
+    def add_multiple_lessons(self, course_id: str, lessons: List[dict], videos: Optional[List[dict]] = None, check_course: bool = True):
         """
         Add multiple lessons to a course.
 
+        Lessons and videos are given as column mappings with their ids already
+        set, and are written with one INSERT ... RETURNING per table in a single
+        transaction. The returned rows stay loaded after the commit, so nothing
+        is read back.
+
         Args:
             course_id (str): The course ID.
-            lessons (List[Lesson]): The list of lesson objects.
+            lessons (List[dict]): The lesson rows.
+            videos (Optional[List[dict]]): The video rows for those lessons.
+            check_course (bool): Whether to check the course exists first;
+                callers that have just created it can skip this.
 
         Returns:
-            List[Lesson]: The list of added lesson objects.
+            List[Lesson]: The list of added lesson objects with their videos loaded.
 
         Raises:
             NotFoundError: If the course is not found.
         """
         try:
-            course = self.db.query(Course).filter(Course.id == course_id).first()
-            if not course:
-                return None, None
-            self.db.add_all(lessons)
-            self.db.commit()
-            return _wrap_return(lessons)
+            if check_course:
+                course_exists = self.db.query(
+                    self.db.query(Course).filter(Course.id == course_id).exists()
+                ).scalar()
+                if not course_exists:
+                    return None, None
+            created_lessons = self.db.scalars(insert(Lesson).returning(Lesson), lessons).all()
+            created_videos = {}
+            if videos:
+                for video in self.db.scalars(insert(Video).returning(Video), videos):
+                    created_videos[video.lesson_id] = video
+            for lesson in created_lessons:
+                set_committed_value(lesson, "video", created_videos.get(lesson.id))
+            commit_without_expiring(self.db)
+            return _wrap_return(sorted(created_lessons, key=lambda lesson: lesson.order))
         except Exception as e:
+            self.db.rollback()
             return _wrap_error(e)
 
     def add_lesson(self, course_id: str, lesson: Lesson):
@@ -123,33 +210,38 @@ class LessonRepository:
         """
         Edit a lesson.
 
+        The lesson is updated with UPDATE ... RETURNING, so it is found,
+        written and read back in one round trip.
+
         Args:
             course_id (str): The course ID.
             lesson_id (str): The lesson ID.
             lesson_data (dict): The lesson data to update.
 
         Returns:
-            Lesson: The updated lesson object.
+            Lesson: The updated lesson object, or None if the lesson is not found.
 
         Raises:
             NotFoundError: If the lesson is not found.
         """
         try:
-            lesson_to_update = (
-                self.db.query(Lesson)
-                .filter(Lesson.course_id == course_id)
-                .filter(Lesson.id == lesson_id)
-                .first()
-            )
-            if not lesson_to_update:
+            values = _column_values(Lesson, lesson_data)
+            if not values:
+                return self.get_lesson_by_id(course_id, lesson_id)
+            lesson = self.db.scalars(
+                update(Lesson)
+                .where(Lesson.course_id == course_id)
+                .where(Lesson.id == lesson_id)
+                .values(**values)
+                .returning(Lesson)
+            ).one_or_none()
+            if not lesson:
+                self.db.rollback()
                 return None, None
-            for key, value in lesson_data.items():
-                if hasattr(lesson_to_update, key):
-                    setattr(lesson_to_update, key, value)
-            self.db.commit()
-            self.db.refresh(lesson_to_update)
-            return _wrap_return(lesson_to_update)
+            commit_without_expiring(self.db)
+            return _wrap_return(lesson)
         except Exception as e:
+            self.db.rollback()
             return _wrap_error(e)
 
     def delete_lesson(self, course_id: str, lesson_id: str):
@@ -223,11 +315,46 @@ class LessonRepository:
         except Exception as e:
             return _wrap_error(e)
 
-    def get_lesson_video(self, lesson_id: str):
+    def add_video_to_lesson(self, course_id: str, lesson_id: str, video_data: dict):
         """
-        Get the video for a lesson.
+        Add a video to a lesson of a course.
+
+        The lesson is checked with an EXISTS query and the video is written
+        with INSERT ... RETURNING, so its server-set columns come back without
+        a refresh.
+
+        Args:
+            course_id (str): The course ID.
+            lesson_id (str): The lesson ID.
+            video_data (dict): The video columns, with the secret key already encrypted.
+
+        Returns:
+            Video: The added video object, or None if the lesson is not found.
+        """
+        try:
+            lesson_exists = self.db.query(
+                self.db.query(Lesson)
+                .filter(Lesson.course_id == course_id)
+                .filter(Lesson.id == lesson_id)
+                .exists()
+            ).scalar()
+            if not lesson_exists:
+                return None, None
+            video = self.db.scalars(
+                insert(Video).values(**video_data, lesson_id=lesson_id).returning(Video)
+            ).one()
+            commit_without_expiring(self.db)
+            return _wrap_return(video)
+        except Exception as e:
+            self.db.rollback()
+            return _wrap_error(e)
+
+    def get_lesson_video(self, course_id: str, lesson_id: str):
+        """
+        Get the video for a lesson of a course.
 
         Args:
+            course_id (str): The course ID.
             lesson_id (str): The lesson ID.
 
         Returns:
@@ -236,7 +363,9 @@ class LessonRepository:
         try:
             video = (
                 self.db.query(Video)
+                .join(Lesson, Lesson.id == Video.lesson_id)
                 .filter(Video.lesson_id == lesson_id)
+                .filter(Lesson.course_id == course_id)
                 .first()
             )
             return _wrap_return(video)
@@ -269,56 +398,62 @@ class LessonRepository:
         """
         Delete a video.
 
+        The video is deleted with DELETE ... RETURNING, so there is no SELECT first.
+
         Args:
             video_id (str): The video ID.
 
         Returns:
-            Video: The deleted video object.
+            Video: The deleted video object, or None if the video is not found.
 
         Raises:
             NotFoundError: If the video is not found.
         """
         try:
-            video_to_delete = (
-                self.db.query(Video)
-                .filter(Video.id == video_id)
-                .first()
-            )
-            if not video_to_delete:
+            video = self.db.scalars(
+                delete(Video).where(Video.id == video_id).returning(Video)
+            ).one_or_none()
+            if not video:
+                self.db.rollback()
                 return None, None
-            self.db.delete(video_to_delete)
-            self.db.commit()
-            return _wrap_return(video_to_delete)
+            commit_without_expiring(self.db)
+            return _wrap_return(video)
         except Exception as e:
+            self.db.rollback()
             return _wrap_error(e)
 
     def edit_video(self, video_id: str, video_data: dict):
         """
         Edit a video.
 
+        The video is updated with UPDATE ... RETURNING, so it is found,
+        written and read back in one round trip.
+
         Args:
             video_id (str): The video ID.
             video_data (dict): The video data to update.
 
         Returns:
-            Video: The updated video object.
+            Video: The updated video object, or None if the video is not found.
 
         Raises:
             NotFoundError: If the video is not found.
         """
         try:
-            video_to_update = (
-                self.db.query(Video)
-                .filter(Video.id == video_id)
-                .first()
-            )
-            if not video_to_update:
+            values = _column_values(Video, video_data)
+            if not values:
+                return self.get_lesson_video_by_id(video_id)
+            video = self.db.scalars(
+                update(Video)
+                .where(Video.id == video_id)
+                .values(**values)
+                .returning(Video)
+            ).one_or_none()
+            if not video:
+                self.db.rollback()
                 return None, None
-            for key, value in video_data.items():
-                if hasattr(video_to_update, key):
-                    setattr(video_to_update, key, value)
-            self.db.commit()
-            self.db.refresh(video_to_update)
-            return _wrap_return(video_to_update)
+            commit_without_expiring(self.db)
+            return _wrap_return(video)
         except Exception as e:
+            self.db.rollback()
             return _wrap_error(e)
@@ -1,8 +1,8 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from app.domain.model.course import Payment
 from app.utils.exceptions.exceptions import NotFoundError
 from typing import Tuple, Optional, Any
-from sqlalchemy import func
+from sqlalchemy import func, update
 
 def _wrap_return(result: Any) -> Tuple[Any, None]:
     return result, None
@@ -52,6 +52,27 @@ class PaymentRepository:
         except Exception as e:
             return _wrap_error(e)
 
+    def get_payment_with_user_course(self, tx_ref: str):
+        """
+        Get a payment by transaction reference with its user and course loaded.
+
+        Args:
+            tx_ref (str): The transaction reference.
+
+        Returns:
+            Payment: The payment object with `user` and `course` joined, None if not found.
+        """
+        try:
+            payment = (
+                self.db.query(Payment)
+                .options(joinedload(Payment.user), joinedload(Payment.course))
+                .filter(Payment.tx_ref == tx_ref)
+                .first()
+            )
+            return _wrap_return(payment)
+        except Exception as e:
+            return _wrap_error(e)
+
     def get_payment_by_id(self, payment_id: str):
         """
         Get a payment by ID.
@@ -88,20 +109,59 @@ class PaymentRepository:
             NotFoundError: If the payment is not found.
         """
         try:
-            payment, err = self.get_payment(tx_ref)
-            if err:
-                return None, err
+            # Single UPDATE ... RETURNING instead of SELECT + UPDATE + refresh
+            payment = self.db.execute(
+                update(Payment)
+                .where(Payment.tx_ref == tx_ref)
+                .values(status=status, ref_id=ref_id)
+                .returning(Payment)
+            ).scalar_one_or_none()
             if not payment:
+                self.db.rollback()
                 return None, NotFoundError(detail="Payment not found")
-            payment.status = status
-            payment.ref_id = ref_id
             self.db.commit()
-            self.db.refresh(payment)
             return _wrap_return(payment)
         except Exception as e:
             self.db.rollback()
             return _wrap_error(e)
 
+    def _payments_query(self, owner_column, owner_id, filter, year, month, week, day):
+        # Payments of one user or course with the status and date filters applied
+        query = self.db.query(Payment).filter(owner_column == owner_id)
+        if filter:
+            query = query.filter(Payment.status == filter)
+        if year is not None:
+            query = query.filter(func.extract('year', Payment.updated_at) == year)
+        if month is not None:
+            query = query.filter(func.extract('month', Payment.updated_at) == month)
+        if week is not None:
+            query = query.filter(func.extract('week', Payment.updated_at) == week)
+        if day is not None:
+            query = query.filter(func.extract('day', Payment.updated_at) == day)
+        return query
+
+    def _paginated_payments(self, query, page, page_size):
+        """
+        Return `(payments, total)` for a filtered payments query.
+
+        When paginating, the total comes back on every row of the page as a
+        window count, so page and total are a single query; it is only
+        counted separately when the page is empty. Without pagination the
+        total is None.
+        """
+        query = query.order_by(Payment.updated_at.desc())
+        if page is None or page_size is None:
+            return query.all(), None
+        rows = (
+            query.add_columns(func.count().over().label("total"))
+            .offset((page - 1) * page_size)
+            .limit(page_size)
+            .all()
+        )
+        if not rows:
+            return [], query.order_by(None).count()
+        return [row[0] for row in rows], rows[0].total
+
     def get_user_payments(
         self,
         user_id: str,
@@ -115,24 +175,14 @@ class PaymentRepository:
     ):
         """
         Get all payments for a user, optional pagination, status & date filters.
+
+        Returns:
+            Tuple[List[Payment], Optional[int]]: The payments and, when paginating,
+                the total number of matching payments.
         """
         try:
-            query = self.db.query(Payment).filter(Payment.user_id == user_id)
-            if filter:
-                query = query.filter(Payment.status == filter)
-            if year is not None:
-                query = query.filter(func.extract('year', Payment.updated_at) == year)
-            if month is not None:
-                query = query.filter(func.extract('month', Payment.updated_at) == month)
-            if week is not None:
-                query = query.filter(func.extract('week', Payment.updated_at) == week)
-            if day is not None:
-                query = query.filter(func.extract('day', Payment.updated_at) == day)
-
-            if page is not None and page_size is not None:
-                query = query.offset((page - 1) * page_size).limit(page_size)
-            results = query.order_by(Payment.updated_at.desc()).all()
-            return _wrap_return(results)
+            query = self._payments_query(Payment.user_id, user_id, filter, year, month, week, day)
+            return _wrap_return(self._paginated_payments(query, page, page_size))
         except Exception as e:
             return _wrap_error(e)
 
@@ -160,18 +210,7 @@ class PaymentRepository:
             int: The count of payments.
         """
         try:
-            query = self.db.query(Payment).filter(Payment.user_id == user_id)
-            if filter:
-                query = query.filter(Payment.status == filter)
-            if year is not None:
-                query = query.filter(func.extract('year', Payment.updated_at) == year)
-            if month is not None:
-                query = query.filter(func.extract('month', Payment.updated_at) == month)
-            if week is not None:
-                query = query.filter(func.extract('week', Payment.updated_at) == week)
-            if day is not None:
-                query = query.filter(func.extract('day', Payment.updated_at) == day)
-
+            query = self._payments_query(Payment.user_id, user_id, filter, year, month, week, day)
             count = query.count()
             return _wrap_return(count)
         except Exception as e:
@@ -202,25 +241,12 @@ class PaymentRepository:
             day (Optional[int], optional): Filter by day of updated_at. Defaults to None.
 
         Returns:
-            List[Payment]: A list of payment objects.
+            Tuple[List[Payment], Optional[int]]: The payments and, when paginating,
+                the total number of matching payments.
         """
         try:
-            query = self.db.query(Payment).filter(Payment.course_id == course_id)
-            if filter:
-                query = query.filter(Payment.status == filter)
-            if year is not None:
-                query = query.filter(func.extract('year', Payment.updated_at) == year)
-            if month is not None:
-                query = query.filter(func.extract('month', Payment.updated_at) == month)
-            if week is not None:
-                query = query.filter(func.extract('week', Payment.updated_at) == week)
-            if day is not None:
-                query = query.filter(func.extract('day', Payment.updated_at) == day)
-
-            if page is not None and page_size is not None:
-                query = query.offset((page - 1) * page_size).limit(page_size)
-            results = query.order_by(Payment.updated_at.desc()).all()
-            return _wrap_return(results)
+            query = self._payments_query(Payment.course_id, course_id, filter, year, month, week, day)
+            return _wrap_return(self._paginated_payments(query, page, page_size))
         except Exception as e:
             return _wrap_error(e)
 
@@ -237,18 +263,7 @@ class PaymentRepository:
         Get the count of payments for a course with optional status and date filtering.
         """
         try:
-            query = self.db.query(Payment).filter(Payment.course_id == course_id)
-            if filter:
-                query = query.filter(Payment.status == filter)
-            if year is not None:
-                query = query.filter(func.extract('year', Payment.updated_at) == year)
-            if month is not None:
-                query = query.filter(func.extract('month', Payment.updated_at) == month)
-            if week is not None:
-                query = query.filter(func.extract('week', Payment.updated_at) == week)
-            if day is not None:
-                query = query.filter(func.extract('day', Payment.updated_at) == day)
-
+            query = self._payments_query(Payment.course_id, course_id, filter, year, month, week, day)
             count = query.count()
             return _wrap_return(count)
         except Exception as e:
@@ -7,6 +7,7 @@ from sqlalchemy.exc import DataError
 from typing import Tuple, Optional, Any
 from sqlalchemy import or_
 from app.utils.security.hash import hash_password, verify_password
+from app.utils.helper import as_uuid
 
 def _wrap_return(result: Any) -> Tuple[Any, Optional[Exception]]:
     return result, None
@@ -79,9 +80,10 @@ class UserRepository:
 
     def get_user_by_id(self, user_id: str):
         try:
-            user = self.db.query(User).filter(User.id == user_id).first()
+            # Session.get answers from the identity map when this request already loaded the user
+            user = self.db.get(User, as_uuid(user_id))
             return _wrap_return(user)
-        except DataError as e:
+        except (DataError, ValueError) as e:
             return _wrap_error(e)
 
 
@@ -137,6 +139,13 @@ class UserRepository:
             self.db.rollback()
             return _wrap_error(e)
 
+    def get_user_role(self, user_id: str):
+        try:
+            role = self.db.query(User.role).filter(User.id == user_id).scalar()
+            return _wrap_return(role)
+        except Exception as e:
+            return _wrap_error(e)
+
     #update the role of the user
     def update_role(self, user_id: int, role: str):
         try:
@@ -5,6 +5,7 @@ from app.domain.schema.courseSchema import (
     CourseEditInput,
     SearchParams,
     DateFilterParams,
+    CursorDateFilterParams,
     InstructorEnrollmentsResponse
 )
 from app.service.userService import UserService, get_user_service
@@ -107,7 +108,7 @@ async def update_user_role(
 
 # get courses enrolled by user
 @admin_router.get("/user/{user_id}/enrolled")
-async def get_users_enrolled_in_course(
+def get_users_enrolled_in_course(
     user_id: str,
     search_params: SearchParams = Depends(),
     course_service: CourseService = Depends(get_course_service)
@@ -132,7 +133,7 @@ async def get_users_enrolled_in_course(
 
 # Course management endpoints
 @admin_router.post("/courses/add")
-async def add_course(
+def add_course(
     course_info: CourseInput,
     course_service: CourseService = Depends(get_course_service)
 ):
@@ -158,10 +159,10 @@ async def add_thumbnail_to_course(
     """
     Add a thumbnail to a course.
     """
-    return course_service.addThumbnail(course_id, thumbnail, thumbnail_name)
+    return await course_service.addThumbnail(course_id, thumbnail, thumbnail_name)
 
 @admin_router.put("/courses/{course_id}")
-async def update_course(
+def update_course(
     course_id: str,
     course_info: CourseEditInput,
     course_service: CourseService = Depends(get_course_service)
@@ -184,7 +185,7 @@ async def update_course(
     return course_service.updateCourse(course_id, course_info)
 
 @admin_router.delete("/courses/{course_id}")
-async def delete_course(
+def delete_course(
     course_id: str,
     course_service: CourseService = Depends(get_course_service)
 ):
@@ -310,7 +311,7 @@ async def delete_course(
 #     )
 
 @admin_router.get("/payments/{payment_id}")
-async def get_payment(
+def get_payment(
     payment_id: str,
     payment_service: PaymentService = Depends(get_payment_service)
 ):
@@ -373,9 +374,9 @@ inst_admin_router = APIRouter(
 )
 
 @inst_admin_router.get("/courses/{course_id}/enrolled")
-async def get_users_enrolled_in_course(
+def get_users_enrolled_in_course(
     course_id: str,
-    search_params: DateFilterParams = Depends(),
+    search_params: CursorDateFilterParams = Depends(),
     course_service: CourseService = Depends(get_course_service),
     decoded_token: dict = Depends(is_admin_or_instructor)
 ):
@@ -384,7 +385,7 @@ async def get_users_enrolled_in_course(
 
     Args:
         course_id (str): The course ID.
-        search_params (DateFilterParams): The search parameters for filtering by date and pagination.
+        search_params (CursorDateFilterParams): The search parameters for filtering by date and pagination, with an optional cursor.
         course_service (CourseService): The course service.
         decoded_token (dict): The decoded JWT token containing user information.
 
@@ -402,10 +403,12 @@ async def get_users_enrolled_in_course(
         search_params.day,
         search_params.page,
         search_params.page_size,
+        search_params.cursor,
+        search_params.include_total,
     )
 
 @inst_admin_router.get("/course/{course_id}")
-async def get_course_payments(
+def get_course_payments(
     course_id: str,
     search_params: DateFilterParams = Depends(),
     payment_service: PaymentService = Depends(get_payment_service),
@@ -437,7 +440,7 @@ async def get_course_payments(
     )
 
 @inst_admin_router.get("/instructor/latest/enrollments")
-async def fetch_instructor_enrollments(
+def fetch_instructor_enrollments(
     decoded_token: dict = Depends(is_admin_or_instructor),
     days: int = 7,
     course_service: CourseService = Depends(get_course_service)
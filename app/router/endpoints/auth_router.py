@@ -46,7 +46,7 @@ auth_router = APIRouter(
     #     }
     # }
 )
-async def send_otp(phone_number: str, auth_service: AuthService = Depends(get_auth_service)):
+def send_otp(phone_number: str, auth_service: AuthService = Depends(get_auth_service)):
     """
     Send a one-time password (OTP) to the provided phone number for verification.
 
@@ -89,7 +89,7 @@ async def send_otp(phone_number: str, auth_service: AuthService = Depends(get_au
     #     }
     # }
 )
-async def verify_otp(phone_number: str, code: str, auth_service: AuthService = Depends(get_auth_service)):
+def verify_otp(phone_number: str, code: str, auth_service: AuthService = Depends(get_auth_service)):
     """
     Verify the OTP code sent to the provided phone number.
 
@@ -142,7 +142,7 @@ async def verify_otp(phone_number: str, code: str, auth_service: AuthService = D
     #     }
     # }
 )
-async def signup(sign_up_info: signUp, auth_service: AuthService = Depends(get_auth_service)):
+def signup(sign_up_info: signUp, auth_service: AuthService = Depends(get_auth_service)):
     """
     Register a new user account.
 
@@ -207,7 +207,7 @@ async def signup(sign_up_info: signUp, auth_service: AuthService = Depends(get_a
     #     }
     # }
 )
-async def login_endpoint(
+def login_endpoint(
     login_info: login,
     auth_service: AuthService = Depends(get_auth_service)
 ):
@@ -259,7 +259,7 @@ async def login_endpoint(
     #     }
     # }
 )
-async def logout(refresh_token: str = Header(None), auth_service: AuthService = Depends(get_auth_service)):
+def logout(refresh_token: str = Header(None), auth_service: AuthService = Depends(get_auth_service)):
     """
     Log out a user by invalidating their refresh token.
 
@@ -303,7 +303,7 @@ async def logout(refresh_token: str = Header(None), auth_service: AuthService =
     #     }
     # }
 )
-async def refresh_token(
+def refresh_token(
     refresh_token_request: RefreshTokenRequest,
     auth_service: AuthService = Depends(get_auth_service)
 ):
@@ -325,7 +325,7 @@ async def refresh_token(
     summary="Initiate password reset",
     description="Send OTP to user's phone number for password reset."
 )
-async def forget_password(
+def forget_password(
     forget_password_request: ForgetPasswordRequest,
     auth_service: AuthService = Depends(get_auth_service)
 ):
@@ -347,7 +347,7 @@ async def forget_password(
     summary="Verify OTP for password reset",
     description="Verify the OTP code sent for password reset."
 )
-async def verify_otp_password_reset(
+def verify_otp_password_reset(
     verify_request: VerifyOTPForPasswordReset,
     auth_service: AuthService = Depends(get_auth_service)
 ):
@@ -369,7 +369,7 @@ async def verify_otp_password_reset(
     summary="Reset user password",
     description="Reset user password after OTP verification."
 )
-async def reset_password(
+def reset_password(
     reset_request: ResetPassword,
     auth_service: AuthService = Depends(get_auth_service)
 ):
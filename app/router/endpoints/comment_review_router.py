@@ -11,7 +11,7 @@ from app.domain.schema.responseSchema import (
 from app.service.comment_review_service import CommentReviewService, get_comment_review_service
 from app.utils.middleware.dependancies import is_logged_in
 from uuid import UUID
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 # Comment router
 comment_router = APIRouter(
@@ -109,6 +109,7 @@ async def get_course_comments(
     course_id: str,
     page: int = 1,
     page_size: int = 10,
+    cursor: Optional[str] = None,
     comment_review_service: CommentReviewService = Depends(get_comment_review_service)
 ):
     """
@@ -120,11 +121,13 @@ async def get_course_comments(
     - **course_id**: UUID of the course
     - **page**: Page number for pagination (default: 1)
     - **page_size**: Number of items per page (default: 10, max: 100)
+    - **cursor**: Optional `next_cursor` from a previous page for constant-cost deep paging
     """
     return comment_review_service.get_course_comments(
         course_id=course_id,
         page=page,
-        page_size=page_size
+        page_size=page_size,
+        cursor=cursor
     )
 
 @comment_router.get(
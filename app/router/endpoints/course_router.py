@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, status
 from app.domain.schema.courseSchema import (
-    SearchParams,
+    CursorSearchParams,
     CourseResponse,
     EnrollmentResponse,
     EnrollResponse,
@@ -12,9 +12,10 @@ from app.domain.schema.responseSchema import (
     BaseResponse, ErrorResponse, PaginatedResponse
 )
 from app.service.courseService import CourseService, get_course_service
-from app.utils.middleware.dependancies import is_logged_in, is_admin, is_admin_or_instructor
+from app.utils.middleware.dependancies import is_logged_in, is_admin, is_admin_or_instructor, get_optional_user
 from uuid import UUID
-from typing import Dict, Any
+from app.utils.helper import PydanticJSONResponse
+from typing import Dict, Any, Optional
 
 # Course router
 course_router = APIRouter(
@@ -44,8 +45,9 @@ course_router = APIRouter(
     #     }
     # }
 )
-async def get_courses(
-    search_params: SearchParams = Depends(),
+def get_courses(
+    search_params: CursorSearchParams = Depends(),
+    decoded_token: Optional[dict] = Depends(get_optional_user),
     course_service: CourseService = Depends(get_course_service)
 ):
     """
@@ -58,13 +60,22 @@ async def get_courses(
     - **page_size**: Number of items per page (default: 10, max: 100)
     - **search**: Optional search term to filter courses by title or description
     - **filter**: Optional filter parameter (e.g., 'price_low', 'price_high', 'newest')
+    - **cursor**: Optional `next_cursor` from a previous page for constant-cost deep paging
+    - **include_total**: Also return `total_items` (costs an extra COUNT; offset pages only)
+
+    When called with a bearer token, every course also carries `is_enrolled`
+    for the current user.
     """
-    return course_service.getCourses(
+    # Returning the response directly skips FastAPI's jsonable_encoder pass
+    return PydanticJSONResponse(course_service.getCourses(
         page=search_params.page,
         page_size=search_params.page_size,
         search=search_params.search,
-        filter=search_params.filter
-    )
+        filter=search_params.filter,
+        cursor=search_params.cursor,
+        include_total=search_params.include_total,
+        user_id=str(decoded_token.get("id")) if decoded_token else None
+    ))
 
 @course_router.get(
     "/enrolled",
@@ -97,8 +108,8 @@ async def get_courses(
     #     }
     # }
 )
-async def get_enrolled_courses(
-    search_params: SearchParams = Depends(),
+def get_enrolled_courses(
+    search_params: CursorSearchParams = Depends(),
     decoded_token: dict = Depends(is_logged_in),
     course_service: CourseService = Depends(get_course_service)
 ):
@@ -111,6 +122,8 @@ async def get_enrolled_courses(
     - **page**: Page number for pagination (default: 1)
     - **page_size**: Number of items per page (default: 10, max: 100)
     - **search**: Optional search term to filter enrolled courses by title or description
+    - **cursor**: Optional `next_cursor` from a previous page for constant-cost deep paging
+    - **include_total**: Also return `total_items` (costs an extra COUNT; offset pages only)
 
     Authentication is required via JWT token in the Authorization header.
     """
@@ -120,9 +133,11 @@ async def get_enrolled_courses(
         user_id=user_id,
         page=search_params.page,
         page_size=search_params.page_size,
-        search=search_params.search
+        search=search_params.search,
+        cursor=search_params.cursor,
+        include_total=search_params.include_total
     )
-    return response
+    return PydanticJSONResponse(response)
 
 @course_router.post(
     "/enroll/{course_id}",
@@ -164,7 +179,7 @@ async def get_enrolled_courses(
     #     }
     # }
 )
-async def enroll_course(
+def enroll_course(
     course_id: str,
     decoded_token: dict = Depends(is_logged_in),
     course_service: CourseService = Depends(get_course_service)
@@ -230,7 +245,7 @@ async def enroll_course(
     #     }
     # }
 )
-async def unenroll_course(
+def unenroll_course(
     course_id: str,
     decoded_token: dict = Depends(is_logged_in),
     course_service: CourseService = Depends(get_course_service)
@@ -273,7 +288,7 @@ async def unenroll_course(
     #     }
     # }
 )
-async def get_course(
+def get_course(
     course_id: str,
     course_service: CourseService = Depends(get_course_service)
 ):
@@ -285,8 +300,29 @@ async def get_course(
 
     - **course_id**: UUID of the course to retrieve
     """
-    course_response = course_service.getCourse(course_id)
-    return course_response
+    return PydanticJSONResponse(course_service.getCourse(course_id))
+
+@course_router.get(
+    "/{course_id}/details",
+    status_code=status.HTTP_200_OK,
+    summary="Get a course with the current user's enrollment status",
+    description="Returns the course like `GET /{course_id}` plus `is_enrolled` for the authenticated user, in a single query."
+)
+def get_course_for_user(
+    course_id: str,
+    decoded_token: dict = Depends(is_logged_in),
+    course_service: CourseService = Depends(get_course_service)
+):
+    """
+    Retrieve a course and whether the current user is enrolled in it.
+
+    Prefer this over calling `GET /{course_id}` and `GET /{course_id}/is_enrolled`
+    back to back on course pages for signed-in users.
+
+    - **course_id**: UUID of the course to retrieve
+    """
+    user_id = str(decoded_token.get("id"))
+    return PydanticJSONResponse(course_service.get_course_for_user(course_id, user_id))
 
 @course_router.get(
     "/{course_id}/is_enrolled",
@@ -294,7 +330,7 @@ async def get_course(
     summary="Check if current user is enrolled in a course",
     description="Returns `is_enrolled: true` if the authenticated user is enrolled, otherwise `false`."
 )
-async def is_user_enrolled(
+def is_user_enrolled(
     course_id: str,
     decoded_token: dict = Depends(is_logged_in),
     course_service: CourseService = Depends(get_course_service)
@@ -315,7 +351,7 @@ analysis_router = APIRouter(
     description="Retrieve analytics for courses assigned to the authenticated instructor.",
     dependencies=[Depends(is_admin_or_instructor)]
 )
-async def get_instructor_courses_analytics(
+def get_instructor_courses_analytics(
     params: DateFilterParams = Depends(),
     decoded_token: dict = Depends(is_admin_or_instructor),
     course_service: CourseService = Depends(get_course_service)
@@ -383,7 +419,7 @@ async def get_instructor_courses_analytics(
     #     }
     # }
 )
-async def get_courses_by_instructor(
+def get_courses_by_instructor(
     instructor_id: str,
     course_service: CourseService = Depends(get_course_service)
 ):
@@ -406,7 +442,7 @@ async def get_courses_by_instructor(
     description="Retrieve analytics for all courses in the system with date filtering and pagination.",
     dependencies=[Depends(is_admin)]
 )
-async def get_all_courses_analytics(
+def get_all_courses_analytics(
     params: DateFilterParams = Depends(),
     course_service: CourseService = Depends(get_course_service),
     decoded_token: dict = Depends(is_admin)
@@ -487,7 +523,7 @@ async def get_all_courses_analytics(
     #     }
     # }
 )
-async def get_courses_analysis(
+def get_courses_analysis(
     course_id: str,
     params: DateFilterParams = Depends(),
     course_service: CourseService = Depends(get_course_service)
@@ -10,6 +10,7 @@ from app.domain.schema.responseSchema import (
 )
 from app.service.lesson_service import LessonService, get_lesson_service
 from app.utils.middleware.dependancies import is_admin, is_logged_in
+from app.utils.helper import PydanticJSONResponse
 from typing import Dict, Any, List
 
 # Public lesson router
@@ -96,7 +97,7 @@ protected_lesson_router = APIRouter(
     #     }
     # }
 )
-async def get_lessons(
+def get_lessons(
     course_id: str,
     decoded_token: dict = Depends(is_logged_in),
     search_params: PaginationParams = Depends(),
@@ -115,12 +116,13 @@ async def get_lessons(
     Authentication is required via JWT token in the Authorization header.
     """
     user_id = decoded_token.get("id")
-    return lesson_service.get_lessons(
+    # Returning the response directly skips FastAPI's jsonable_encoder pass
+    return PydanticJSONResponse(lesson_service.get_lessons(
         course_id,
         user_id,
         search_params.page,
         search_params.page_size
-    )
+    ))
 
 @lesson_router.get(
     "/{course_id}/{lesson_id}",
@@ -183,7 +185,7 @@ async def get_lessons(
     #     }
     # }
 )
-async def get_lesson_by_id(
+def get_lesson_by_id(
     course_id: str,
     lesson_id: str,
     decoded_token: dict = Depends(is_logged_in),
@@ -202,7 +204,7 @@ async def get_lesson_by_id(
     Authentication is required via JWT token in the Authorization header.
     """
     user_id = decoded_token.get("id")
-    return lesson_service.get_lesson_by_id(course_id, lesson_id, user_id)
+    return PydanticJSONResponse(lesson_service.get_lesson_by_id(course_id, lesson_id, user_id))
 
 
 @protected_lesson_router.delete(
@@ -232,7 +234,7 @@ async def get_lesson_by_id(
     #     }
     # }
 )
-async def delete_video(
+def delete_video(
     video_id: str,
     lesson_service: LessonService = Depends(get_lesson_service)
 ):
@@ -273,7 +275,7 @@ async def delete_video(
     #     }
     # }
 )
-async def update_video(
+def update_video(
     video_id: str,
     video_input: VideoInput,
     lesson_service: LessonService = Depends(get_lesson_service)
@@ -322,7 +324,7 @@ async def update_video(
     #     }
     # }
 )
-async def get_video(
+def get_video(
     video_id: str,
     lesson_service: LessonService = Depends(get_lesson_service)
 ):
@@ -394,7 +396,7 @@ async def get_video(
     #     }
     # }
 )
-async def add_multiple_lessons(
+def add_multiple_lessons(
     course_id: str,
     lessons_input: MultipleLessonInput,
     lesson_service: LessonService = Depends(get_lesson_service)
@@ -420,7 +422,7 @@ async def add_multiple_lessons(
 
     If video information is provided, the secret key will be encrypted before storage.
     """
-    return lesson_service.add_multiple_lessons(course_id, lessons_input)
+    return lesson_service.add_multiple_lessons(course_id, lessons_input.lessons)
 
 @protected_lesson_router.post(
     "/{course_id}/{lesson_id}/video",
@@ -465,7 +467,7 @@ async def add_multiple_lessons(
     #     }
     # }
 )
-async def add_video_to_lesson(
+def add_video_to_lesson(
     course_id: str,
     lesson_id: str,
     video_input: VideoInput,
@@ -524,7 +526,7 @@ async def add_video_to_lesson(
     #     }
     # }
 )
-async def get_lesson_video(
+def get_lesson_video(
     course_id: str,
     lesson_id: str,
     lesson_service: LessonService = Depends(get_lesson_service)
@@ -588,7 +590,7 @@ async def get_lesson_video(
     #     }
     # }
 )
-async def edit_lesson(
+def edit_lesson(
     course_id: str,
     lesson_id: str,
     lesson_data: dict,
@@ -640,7 +642,7 @@ async def edit_lesson(
     #     }
     # }
 )
-async def delete_lesson(
+def delete_lesson(
     course_id: str,
     lesson_id: str,
     lesson_service: LessonService = Depends(get_lesson_service)
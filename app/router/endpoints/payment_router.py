@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, BackgroundTasks
 from app.domain.schema.courseSchema import (
     SearchParams,
     CallbackPayload,
@@ -7,6 +7,9 @@ from app.domain.schema.courseSchema import (
 from app.service.payment_service import PaymentService, get_payment_service
 from app.utils.middleware.dependancies import is_admin, is_logged_in
 from uuid import UUID
+import logging
+
+logger = logging.getLogger(__name__)
 
 # Public payment router
 payment_router = APIRouter(
@@ -22,7 +25,7 @@ protected_payment_router = APIRouter(
 )
 
 @payment_router.post("/{course_id}/initiate")
-async def initiate_payment(
+def initiate_payment(
     course_id: str,
     decoded_token: dict = Depends(is_logged_in),
     payment_service: PaymentService = Depends(get_payment_service)
@@ -45,10 +48,11 @@ async def initiate_payment(
     return payment_service.initiate_payment(user_id, course_id)
 
 @payment_router.get("/callback")
-async def payment_callback(
+def payment_callback(
     callback: str,
     trx_ref: str,
     status: str,
+    background_tasks: BackgroundTasks,
     payment_service: PaymentService = Depends(get_payment_service)
 ):
     """
@@ -58,17 +62,18 @@ async def payment_callback(
         callback (str): The callback reference.
         trx_ref (str): The transaction reference.
         status (str): The payment status.
+        background_tasks (BackgroundTasks): Runs the enrollment SMS after the response.
         payment_service (PaymentService): The payment service.
         
     Returns:
         dict: The enrollment response.
     """
-    print(f"Callback: {callback}")
+    logger.debug("Payment callback %s for %s", callback, trx_ref)
     payload = CallbackPayload(trx_ref=trx_ref, ref_id=callback, status=status) 
-    return payment_service.process_payment_callback(payload)
+    return payment_service.process_payment_callback(payload, background_tasks)
 
 @protected_payment_router.get("/user/{user_id}")
-async def get_user_payments(
+def get_user_payments(
     user_id: str,
     search_params: DateFilterParams = Depends(),
     payment_service: PaymentService = Depends(get_payment_service)
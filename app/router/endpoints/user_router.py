@@ -207,7 +207,7 @@ async def upload_profile_picture(
     user_id = decoded_token.get("id")
     user_id = UUID(user_id)
 
-    return user_service.upload_profile_picture(str(user_id), profile_picture)
+    return await user_service.upload_profile_picture(str(user_id), profile_picture)
 
 # @user_router.get("/all")
 # async def get_all_users(
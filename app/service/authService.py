@@ -12,6 +12,12 @@ from app.utils.security.hash import hash_password, verify_password
 from app.utils.security.jwt_handler import verify_refresh_token, verify_access_token, create_access_token, create_refresh_token, create_password_reset_token, verify_password_reset_token
 from app.utils.otp.sms import send_otp_sms, verify_otp_sms
 from app.utils.helper import normalize_phone_number, format_phone_for_sending
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Ethiopian mobile number, with or without the +251 / 0 prefix
+PHONE_NUMBER_PATTERN = re.compile(r'^(?:\+251|0)?9\d{8}$')
 
 
 class AuthService:
@@ -20,8 +26,7 @@ class AuthService:
 
     def signUp(self, sign_up_data: signUp):
         # Validate and normalize phone number
-        regex = r'^(?:\+251|0)?9\d{8}$'
-        if not re.match(regex, sign_up_data.phone_number):
+        if not PHONE_NUMBER_PATTERN.match(sign_up_data.phone_number):
             raise ValidationError(detail="Invalid phone number")
 
         # Normalize phone number to raw form (e.g., 966934381)
@@ -54,7 +59,6 @@ class AuthService:
         return response
 
     def login(self, login_data: login):
-        print(login_data)
         # Fetch user by phone number and handle repo errors
         login_data.phone_number = normalize_phone_number(login_data.phone_number)
         user, err = self.user_repo.get_user_by_phone(login_data.phone_number)
@@ -111,16 +115,14 @@ class AuthService:
         return {"access_token": access_token}
 
     def send_otp(self, phone_number: str):
-        print("Sending OTP to phone number:", phone_number)
         phone_number = format_phone_for_sending(phone_number)
         try:
             status_code, content = send_otp_sms(phone_number)
         except Exception as e:
             raise ValidationError(detail="Failed to send OTP", data=str(e))
-        print("Sending OTP to phone number:", phone_number)
         
         if status_code == 200:  # Assuming 200 means success
-            print("OTP sent successfully to:", phone_number)
+            logger.debug("OTP sent")
             return {"detail": "OTP sent successfully", "status_code": status_code}
         else:
             # decode bytes→JSON or utf-8, else leave as is
@@ -134,8 +136,6 @@ class AuthService:
 
 
     def verify_otp(self, phone_number: str, code: str):
-        print("Verifying OTP for phone number:", phone_number)
-        print("OTP code:", code)
         formatted_phone_number = format_phone_for_sending(phone_number)
         try:
             status_code, content = verify_otp_sms(formatted_phone_number, code)
@@ -148,7 +148,6 @@ class AuthService:
             # phone_number = re.sub(r'^(?:\+251|0)', '', phone_number)
                         
             # Activate the user
-            print("Normalized phone number:", phone_number)
             user, err = self.user_repo.activate_user(None, phone_number)
             if err:
                 raise ValidationError(detail="Error activating user after OTP", data=str(err))
@@ -14,6 +14,9 @@ from sqlalchemy.orm import Session
 from fastapi import Depends
 from app.core.config.database import get_db
 from uuid import UUID
+from typing import Optional, List
+from app.utils.helper import parse_cursor, split_page, as_uuid
+from app.utils.pydantic_cache import ta
 
 class CommentReviewService:
     def __init__(self, db):
@@ -121,7 +124,7 @@ class CommentReviewService:
         except NotFoundError as e:
             raise ValidationError(detail=str(e))
 
-    def get_course_comments(self, course_id: str, page: int = 1, page_size: int = 10):
+    def get_course_comments(self, course_id: str, page: int = 1, page_size: int = 10, cursor: Optional[str] = None):
         """
         Retrieve comments for a specific course.
 
@@ -129,6 +132,7 @@ class CommentReviewService:
             course_id (str): ID of the course.
             page (int): Page number for pagination.
             page_size (int): Number of items per page.
+            cursor (Optional[str]): Cursor returned by a previous page; when set, page is ignored.
 
         Returns:
             dict: Response containing paginated comments data and metadata.
@@ -139,6 +143,8 @@ class CommentReviewService:
         if not course_id:
             raise ValidationError(detail="Course ID is required")
 
+        after = parse_cursor(cursor)
+
         # Validate course exists
         course, err = self.course_repo.get_course(course_id)
         if err:
@@ -148,26 +154,31 @@ class CommentReviewService:
         if not course:
             raise ValidationError(detail="Course not found")
 
-        comments, err = self.comment_review_repo.get_comments_by_course(course_id, page, page_size)
+        comments, err = self.comment_review_repo.get_comments_by_course(course_id, page, page_size, after=after)
         if err:
-            if isinstance(err, NotFoundError):
-                raise ValidationError(detail="Course not found for comments")
             raise ValidationError(detail="Failed to retrieve course comments", data=str(err))
+        comments, has_more, next_cursor = split_page(
+            comments, page_size, lambda comment: (comment.created_at, comment.id))
 
-        comments_response = [CommentResponse.model_validate(comment) for comment in comments]
+        comments_response = ta(List[CommentResponse]).validate_python(comments, from_attributes=True)
 
-        total_count, err = self.comment_review_repo.get_comments_count_by_course(course_id)
-        if err:
-            raise ValidationError(detail="Failed to retrieve comment count", data=str(err))
+        data = {
+            "comments": comments_response,
+            "page_size": page_size,
+            "has_more": has_more,
+            "next_cursor": next_cursor
+        }
+        # a cursor page has no page number, and deep cursor pages skip the COUNT
+        if after is None:
+            total_count, err = self.comment_review_repo.get_comments_count_by_course(course_id)
+            if err:
+                raise ValidationError(detail="Failed to retrieve comment count", data=str(err))
+            data["page"] = page
+            data["total_items"] = total_count
 
         return {
             "detail": "Course comments retrieved successfully",
-            "data": {
-                "comments": comments_response,
-                "page": page,
-                "page_size": page_size,
-                "total_items": total_count
-            }
+            "data": data
         }
 
     def get_user_comments(self, user_id: UUID, page: int = 1, page_size: int = 10):
@@ -201,7 +212,7 @@ class CommentReviewService:
         if err:
             raise ValidationError(detail="Failed to retrieve user comments", data=str(err))
 
-        comments_response = [CommentResponse.model_validate(comment) for comment in comments]
+        comments_response = ta(List[CommentResponse]).validate_python(comments, from_attributes=True)
 
         total_count, err = self.comment_review_repo.get_comments_count_by_user(str(user_id))
         if err:
@@ -247,7 +258,7 @@ class CommentReviewService:
                 raise ValidationError(detail="Failed to retrieve comment", data=str(err))
 
             # Check if the user is the author of the comment
-            if str(comment.user_id) != str(user_id):
+            if comment.user_id != as_uuid(user_id):
                 raise ValidationError(detail="You can only update your own comments")
 
             # Update the comment
@@ -298,7 +309,7 @@ class CommentReviewService:
             raise ValidationError(detail="Comment not found")
 
         # Check if the user is the author of the comment
-        if str(comment.user_id) != str(user_id):
+        if comment.user_id != as_uuid(user_id):
             raise ValidationError(detail="You can only delete your own comments")
 
         # Delete the comment
@@ -435,7 +446,7 @@ class CommentReviewService:
                 raise ValidationError(detail="Course not found for reviews")
             raise ValidationError(detail="Failed to retrieve course reviews", data=str(err))
 
-        reviews_response = [ReviewResponse.model_validate(review) for review in reviews]
+        reviews_response = ta(List[ReviewResponse]).validate_python(reviews, from_attributes=True)
 
         average_rating, err = self.comment_review_repo.get_average_rating_by_course(course_id)
         if err:
@@ -488,7 +499,7 @@ class CommentReviewService:
         if err:
             raise ValidationError(detail="Failed to retrieve user reviews", data=str(err))
 
-        reviews_response = [ReviewResponse.model_validate(review) for review in reviews]
+        reviews_response = ta(List[ReviewResponse]).validate_python(reviews, from_attributes=True)
 
         total_count, err = self.comment_review_repo.get_reviews_count_by_user(str(user_id))
         if err:
@@ -539,7 +550,7 @@ class CommentReviewService:
             raise ValidationError(detail="Review not found")
 
         # Check if the user is the author of the review
-        if str(review.user_id) != str(user_id):
+        if review.user_id != as_uuid(user_id):
             raise ValidationError(detail="You can only update your own reviews")
 
         # Update the review
@@ -588,7 +599,7 @@ class CommentReviewService:
             raise ValidationError(detail="Review not found")
 
         # Check if the user is the author of the review
-        if str(review.user_id) != str(user_id):
+        if review.user_id != as_uuid(user_id):
             raise ValidationError(detail="You can only delete your own reviews")
 
         # Delete the review
@@ -1,33 +1,66 @@
 from app.utils.exceptions.exceptions import ValidationError, NotFoundError
-import re
+import json
+from functools import cached_property
 from app.domain.schema.courseSchema import (
     CourseInput,
     CourseResponse,
+    CourseListItemResponse,
     EnrollmentResponse,
     UserResponse,
-    CourseAnalysisResponse,
     InstructorEnrollmentItem,
 )
-from app.domain.model.course import Course, Enrollment
+from app.domain.model.course import Course
 from app.repository.courseRepo import CourseRepository
-from app.repository.lesson_repo import LessonRepository
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
 from fastapi import Depends, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from app.core.config.database import get_db
-from typing import Optional
+from typing import Optional, List
 from app.repository.userRepo import UserRepository
+from app.service.userService import role_cache, owner_cache
 from app.service.payment_service import PaymentService
-from app.service.lesson_service import LessonService
-from app.service.payment_service import PaymentService
-from app.service.lesson_service import LessonService
+from app.service.lesson_service import LessonService, course_cache, lesson_access_cache
 from app.utils.bunny.bunnyStorage import BunnyCDNStorage
 from app.core.config.env import get_settings
-import os
-from tempfile import NamedTemporaryFile
+from app.utils.helper import parse_cursor, split_page, construct_from_orm, as_uuid
+from app.utils.cache.ttl_cache import TTLCache
+from app.utils.pydantic_cache import ta
 
 
 settings = get_settings()
+thumbnail_storage = BunnyCDNStorage(
+    settings.BUNNY_CDN_THUMB_STORAGE_APIKEY,
+    settings.BUNNY_CDN_THUMB_STORAGE_ZONE,
+    settings.BUNNY_CDN_THUMB_PULL_ZONE
+)
+
+# Pagination totals are only informational, so a short staleness window is fine
+count_cache = TTLCache(ttl=30, maxsize=4096)
+# Dashboard analytics tolerate being a couple of minutes behind
+analysis_cache = TTLCache(ttl=120, maxsize=1024)
+
+# Thumbnail content types accepted by addThumbnail
+_ALLOWED_THUMB_TYPES = frozenset({"image/jpeg", "image/png", "image/jpg"})
+
+def _with_discount(course_response):
+    # Prices are shown with the discount applied; the ORM row keeps the stored
+    # price, so nothing flushed later in the request can persist this one
+    discount = course_response.discount
+    if not discount or discount <= 0:
+        return course_response
+    price = course_response.price
+    return course_response.model_copy(update={"price": price - (price * discount / 100)})
+
+def _course_list_item(course):
+    instructor = course.instructor
+    return construct_from_orm(
+        CourseListItemResponse, course,
+        instructor=construct_from_orm(UserResponse, instructor) if instructor else None
+    )
+
 class CourseService:
     def __init__(self, db):
         """
@@ -39,8 +72,34 @@ class CourseService:
         self.db = db
         self.course_repo = CourseRepository(db)
         self.user_repo = UserRepository(db)
-        self.payment_service = PaymentService(db)
-        self.lesson_service = LessonService(db)
+
+    # Only a few methods need these, so build them on first use and share
+    # this service's repositories with them
+    @cached_property
+    def payment_service(self) -> PaymentService:
+        return PaymentService(self.db, course_repo=self.course_repo, user_repo=self.user_repo)
+
+    @cached_property
+    def lesson_service(self) -> LessonService:
+        return LessonService(self.db, course_repo=self.course_repo)
+
+    def _get_user_role(self, user_id: str) -> Optional[str]:
+        """
+        Get a user's role, served from role_cache when possible.
+
+        Args:
+            user_id (str): ID of the user.
+
+        Returns:
+            Optional[str]: The role, or None if the user does not exist.
+
+        Raises:
+            ValidationError: If the lookup fails.
+        """
+        role, err = role_cache.get_or_load(user_id, lambda: self.user_repo.get_user_role(user_id))
+        if err:
+            raise ValidationError(detail="Failed to retrieve instructor", data=str(err))
+        return role
 
     def addCourse(self, course_info: CourseInput):
         """
@@ -62,8 +121,9 @@ class CourseService:
             raise ValidationError(detail="Failed to retrieve instructor", data=str(err))
         if not instructor or not instructor.role == "instructor":
             raise ValidationError(detail="Invalid instructor ID or not an instructor")
+        role_cache.set(str(instructor.id), instructor.role)
 
-        course_data = course_info.model_dump(exclude={'lessons'})
+        course_data = course_info.model_dump()
         course = Course(**course_data)
         created_course, err = self.course_repo.create_course(course)
         if err:
@@ -71,14 +131,15 @@ class CourseService:
         if not created_course:
             raise ValidationError(detail="Failed to create course")
 
+        lessons = []
         if course_info.lessons:
-            self.lesson_service.add_multiple_lessons(str(created_course.id), course_info.lessons)
+            lessons = self.lesson_service.create_lessons(
+                str(created_course.id), course_info.lessons, check_course=False
+            )
 
-        created_course, err = self.course_repo.get_course_with_lessons(str(created_course.id))
-        if err:
-            raise ValidationError(detail="Failed to fetch course with lessons", data=str(err))
-        if not created_course:
-            raise ValidationError(detail="Failed to fetch course with lessons")
+        # Build the response from what was just written instead of reading it back
+        set_committed_value(created_course, "instructor", instructor)
+        set_committed_value(created_course, "lessons", lessons)
         course_response = CourseResponse.model_validate(created_course)
 
         return {
@@ -86,7 +147,7 @@ class CourseService:
             "data": course_response
         }
 
-    def addThumbnail(self, course_id: str, thumbnail: UploadFile, thumbnail_name: str=""):
+    async def addThumbnail(self, course_id: str, thumbnail: UploadFile, thumbnail_name: str=""):
         """
         Add a thumbnail to a course.
 
@@ -103,7 +164,11 @@ class CourseService:
         if not course_id:
             raise ValidationError(detail="Course ID is required")
 
-        course, err = self.course_repo.get_course(course_id)
+        # Reject bad uploads before touching the database
+        if thumbnail.content_type not in _ALLOWED_THUMB_TYPES:
+            raise ValidationError(detail="Invalid image format. Only JPEG and PNG are allowed.")
+
+        course, err = await run_in_threadpool(self.course_repo.get_course, course_id)
         if err:
             if isinstance(err, NotFoundError):
                 raise ValidationError(detail="Course not found")
@@ -111,21 +176,7 @@ class CourseService:
         if not course:
             raise ValidationError(detail="Course not found")
 
-        # Validate and save the thumbnail
-        if not re.match(r"^image/(jpeg|png|jpg)$", thumbnail.content_type):
-            raise ValidationError(detail="Invalid image format. Only JPEG and PNG are allowed.")
-
         try:
-            # 1) Pass the correct storage zone, not the API key twice
-            storage = BunnyCDNStorage(
-                settings.BUNNY_CDN_THUMB_STORAGE_APIKEY,
-                settings.BUNNY_CDN_THUMB_STORAGE_ZONE,
-                settings.BUNNY_CDN_THUMB_PULL_ZONE
-            )
-
-            # 2) Write UploadFile to a temp file so upload_file can open it by path
-            from tempfile import NamedTemporaryFile
-
             # Get original filename and extension
             original_filename = thumbnail.filename
             original_extension = ""
@@ -136,32 +187,21 @@ class CourseService:
             if thumbnail_name:
                 file_name = thumbnail_name
             else:
-                file_name = original_filename
+                file_name = original_filename or "thumbnail"
 
-            # Create a temporary file with the original content
-            with NamedTemporaryFile("wb", delete=False) as tmp:
-                tmp.write(thumbnail.file.read())
-                tmp_path = tmp.name
-
-            # Create a temporary file with the correct extension to help BunnyCDNStorage detect the file type
-            temp_file_with_ext = f"{tmp_path}{original_extension}"
-            import shutil
-            shutil.copy(tmp_path, temp_file_with_ext)
-
-            # Upload and then remove temp files
-            thumbnail_url = storage.upload_file(
+            # Stream the upload without blocking the event loop
+            await thumbnail.seek(0)
+            thumbnail_url = await thumbnail_storage.upload_stream_async(
                 "",
-                file_path=temp_file_with_ext,
-                file_name=file_name
+                thumbnail,
+                file_name=file_name,
+                extension=original_extension
             )
 
-            # Clean up temporary files
-            os.unlink(temp_file_with_ext)
-            os.unlink(tmp_path)
-
-            _, err = self.course_repo.save_thumbnail(course_id, thumbnail_url)
+            _, err = await run_in_threadpool(self.course_repo.save_thumbnail, course_id, thumbnail_url)
             if err:
                 raise ValidationError(detail="Failed to save thumbnail", data=str(err))
+            course_cache.pop(str(course_id))
         except IntegrityError as e:
             raise ValidationError(detail="Failed to save thumbnail", data=str(e))
         except Exception as e:
@@ -190,18 +230,56 @@ class CourseService:
         if not course_id:
             raise ValidationError(detail="Course ID is required")
 
-        course, err = self.course_repo.get_course_with_lessons(course_id)
+        # Course pages are read far more often than edited; writes drop the entry
+        key = str(course_id)
+        course_response = course_cache.get(key)
+        if course_response is None:
+            course, err = self.course_repo.get_course_with_lessons(course_id)
+            if err:
+                if isinstance(err, NotFoundError):
+                    raise ValidationError(detail="Course not found")
+                raise ValidationError(detail="Failed to retrieve course", data=str(err))
+            if not course:
+                raise ValidationError(detail="Course not found")
+
+            course_response = _with_discount(CourseResponse.model_validate(course))
+            course_cache.set(key, course_response)
+        return {"detail": "course fetched successfully", "data": course_response}
+
+    def get_course_for_user(self, course_id: str, user_id: str):
+        """
+        Retrieve a course together with the user's enrollment status.
+
+        Args:
+            course_id (str): ID of the course to retrieve.
+            user_id (str): ID of the user viewing the course.
+
+        Returns:
+            dict: Response containing course details and `is_enrolled`.
+
+        Raises:
+            ValidationError: If the course ID is invalid or the course is not found.
+        """
+        if not course_id:
+            raise ValidationError(detail="Course ID is required")
+        if not user_id:
+            raise ValidationError(detail="User ID is required")
+
+        result, err = self.course_repo.get_course_with_enrollment_flag(course_id, user_id)
         if err:
             if isinstance(err, NotFoundError):
                 raise ValidationError(detail="Course not found")
             raise ValidationError(detail="Failed to retrieve course", data=str(err))
-        if not course:
-            raise ValidationError(detail="Course not found")
+        course, is_enrolled = result
 
-        course_response = CourseResponse.model_validate(course)
-        return {"detail": "course fetched successfully", "data": course_response}
+        course_response = _with_discount(CourseResponse.model_validate(course))
+        return {
+            "detail": "course fetched successfully",
+            "data": course_response,
+            "is_enrolled": is_enrolled
+        }
 
-    def getCourses(self, page: int = 1, page_size: int = 10, search: Optional[str] = None, filter: Optional[str] = None):
+    def getCourses(self, page: int = 1, page_size: int = 10, search: Optional[str] = None, filter: Optional[str] = None, cursor: Optional[str] = None, include_total: bool = False, user_id: Optional[str] = None):
         """
         Retrieve a paginated list of courses.
 
@@ -210,37 +288,89 @@ class CourseService:
             page_size (int): Number of items per page.
             search (Optional[str]): Search query for filtering courses.
             filter (Optional[str]): Additional filter criteria.
+            cursor (Optional[str]): Cursor returned by a previous page; when set, page is ignored.
+            include_total (bool): Also count all matching courses (offset pages only).
+            user_id (Optional[str]): Signed-in user; adds `is_enrolled` to every course.
 
         Returns:
             dict: Response containing paginated course data and metadata.
         """
-        courses, err = self.course_repo.get_courses(page, page_size, search, filter)
+        page, page_size = page or 1, page_size or 10
+        after = parse_cursor(cursor)
+        total_key = ("courses", search, filter)
+        result, err = self.course_repo.get_courses(
+            page, page_size, search, filter, after=after, user_id=user_id,
+            with_total=self._needs_total(total_key, include_total, after)
+        )
         if err:
             raise ValidationError(detail="Failed to retrieve courses", data=str(err))
+        courses, window_total = result
+        courses, has_more, next_cursor = split_page(
+            courses, page_size, lambda course: (course["created_at"], course["id"]))
 
+        # rows are already plain dicts shaped like CourseResponse without lessons
         for course in courses:
-            if course.discount and course.discount>0:
-                course.price = course.price - (course.price * course.discount/100)
-
-        courses_response = [
-            CourseResponse.model_validate(course).model_dump(exclude={'lessons'})
-            for course in courses
-        ]
-
-        total_count, err = self.course_repo.get_total_courses_count(search, filter)
-        if err:
-            raise ValidationError(detail="Failed to retrieve total courses count", data=str(err))
+            if course["discount"] and course["discount"]>0:
+                course["price"] = course["price"] - (course["price"] * course["discount"]/100)
+        courses_response = courses
+
+        pagination = {
+            "page_size": page_size,
+            "has_more": has_more,
+            "next_cursor": next_cursor
+        }
+        # a cursor page has no meaningful page number, so it never carries a total
+        if after is None:
+            pagination["page"] = page
+            if include_total:
+                pagination["total_items"] = self._resolve_total(
+                    total_key, page, page_size, len(courses), has_more, window_total,
+                    lambda: self.course_repo.get_total_courses_count(search, filter),
+                    "Failed to retrieve total courses count"
+                )
 
         return {
             "detail": "Courses fetched successfully",
             "data": courses_response,
-            "pagination": {
-                "page": page,
-                "page_size": page_size,
-                "total_items": total_count
-            }
+            "pagination": pagination
         }
 
+    @staticmethod
+    def _total_from_page(page: Optional[int], page_size: Optional[int], row_count: int, has_more: bool):
+        """
+        Work out the total from the last offset page, or None if a COUNT is needed.
+
+        On the last page the total is just the rows before it plus the rows on it.
+        """
+        if not page or not page_size or has_more:
+            return None
+        if row_count or page == 1:
+            return (page - 1) * page_size + row_count
+        return None
+
+    @staticmethod
+    def _needs_total(key, include_total: bool, after) -> bool:
+        """Whether the page query should also count its matches with a window function."""
+        return include_total and after is None and count_cache.get(key) is None
+
+    def _resolve_total(self, key, page, page_size, row_count: int, has_more: bool, window_total, count_loader, error_detail: str):
+        """
+        Pick the cheapest available total for an offset page.
+
+        The last page gives the total directly; otherwise the window count from
+        the page query is used and cached, and only an empty page past the end
+        falls back to a separate cached COUNT.
+        """
+        total = self._total_from_page(page, page_size, row_count, has_more)
+        if total is None and window_total is not None:
+            total = window_total
+            count_cache.set(key, total)
+        if total is None:
+            total, err = count_cache.get_or_load(key, count_loader)
+            if err:
+                raise ValidationError(detail=error_detail, data=str(err))
+        return total
+
     def getEnrollment(self, user_id: str, course_id: str):
         """
         Retrieve enrollment details for a user in a course.
@@ -266,7 +396,7 @@ class CourseService:
         if not enrollment:
             raise ValidationError(detail="User not enrolled in course")
 
-        enrollment_response = EnrollmentResponse.model_validate(enrollment)
+        enrollment_response = construct_from_orm(EnrollmentResponse, enrollment)
         return {"detail": "Enrollment fetched successfully", "data": enrollment_response}
 
     def enrollCourse(self, user_id: str, course_id: str):
@@ -295,32 +425,32 @@ class CourseService:
 
     #check if user is admin or owner of the course
     def checkAdminOrOwner(self, user_id, course_id):
-        user, err = self.user_repo.get_user_by_id(user_id)
-        if err:
-            if isinstance(err, NotFoundError):
-                raise ValidationError(detail="User not found")
-            raise ValidationError(detail="Failed to retrieve user", data=str(err))
-        if not user:
-            raise ValidationError(detail="User not found")
-
-        if user.role == "admin":
+        # Repeated per request on enrollment listings; grants are cached briefly, denials are not
+        key = (str(user_id), str(course_id))
+        if owner_cache.get(key):
             return True
+        allowed = self._is_admin_or_owner(user_id, course_id)
+        if allowed:
+            owner_cache.set(key, True)
+        return allowed
 
-        course, err = self.course_repo.get_course(course_id)
+    def _is_admin_or_owner(self, user_id, course_id):
+        context, err = self.course_repo.get_auth_context(user_id, course_id)
         if err:
-            if isinstance(err, NotFoundError):
-                raise ValidationError(detail="Course not found")
-            raise ValidationError(detail="Failed to retrieve course", data=str(err))
-        if not course:
-            raise ValidationError(detail="Course not found")
+            raise ValidationError(detail="Failed to check course access", data=str(err))
+        if not context:
+            raise ValidationError(detail="User not found")
 
-        if course.instructor_id == user_id:
+        role, course_found, instructor_id = context
+        if role == "admin":
             return True
+        if not course_found:
+            raise ValidationError(detail="Course not found")
 
-        return False
+        return instructor_id == as_uuid(user_id)
 
 
-    def getEnrolledCourses(self, user_id: str, page: int = 1, page_size: int = 10, search: Optional[str] = None):
+    def getEnrolledCourses(self, user_id: str, page: int = 1, page_size: int = 10, search: Optional[str] = None, cursor: Optional[str] = None, include_total: bool = False):
         """
         Retrieve a paginated list of courses a user is enrolled in.
 
@@ -329,6 +459,8 @@ class CourseService:
             page (int): Page number for pagination.
             page_size (int): Number of items per page.
             search (Optional[str]): Search query for filtering courses.
+            cursor (Optional[str]): Cursor returned by a previous page; when set, page is ignored.
+            include_total (bool): Also count all of the user's courses (offset pages only).
 
         Returns:
             dict: Response containing enrolled courses and pagination metadata.
@@ -339,52 +471,51 @@ class CourseService:
         if not user_id:
             raise ValidationError(detail="User ID is required")
 
-        #check if user exists
-        user, err = self.user_repo.get_user_by_id(user_id)
-        if err:
-            if isinstance(err, NotFoundError):
-                raise ValidationError(detail="User not found")
-            raise ValidationError(detail="Failed to retrieve user", data=str(err))
-        if not user:
-            raise ValidationError(detail="User not found")
-
-        enrollments, err = self.course_repo.get_enrolled_courses(user_id, page, page_size, search)
+        page, page_size = page or 1, page_size or 10
+        after = parse_cursor(cursor)
+        total_key = ("user_courses", str(user_id), search)
+        result, err = self.course_repo.get_enrolled_courses(
+            user_id, page, page_size, search, after=after,
+            with_total=self._needs_total(total_key, include_total, after)
+        )
         if err:
             raise ValidationError(detail="Failed to retrieve enrolled courses", data=str(err))
+        enrollments, window_total = result
+        enrollments, has_more, next_cursor = split_page(
+            enrollments, page_size, lambda enrollment: (enrollment.enrolled_at, enrollment.id))
         if not enrollments:
-            return {
-                "detail": "No courses found for the user",
-                "data": [],
-                "pagination": {
-                    "page": page,
-                    "page_size": page_size,
-                    "total_items": 0
-                }
-            }
+            # enrollments imply the user exists, so only check on an empty page
+            user, err = self.user_repo.get_user_by_id(user_id)
+            if err:
+                if isinstance(err, NotFoundError):
+                    raise ValidationError(detail="User not found")
+                raise ValidationError(detail="Failed to retrieve user", data=str(err))
+            if not user:
+                raise ValidationError(detail="User not found")
 
-        courses_response = [
-            CourseResponse.model_validate(enrollment.course).model_dump(exclude={'lessons'})
-            for enrollment in enrollments
-        ]
+        # models go straight to the JSON encoder; no intermediate dicts
+        courses_response = [_course_list_item(enrollment.course) for enrollment in enrollments]
 
-        total_count, err = self.course_repo.get_user_courses_count(user_id, search)
-        if err:
-            raise ValidationError(detail="Failed to retrieve user courses count", data=str(err))
+        pagination = {
+            "page_size": page_size,
+            "has_more": has_more,
+            "next_cursor": next_cursor
+        }
+        if after is None:
+            pagination["page"] = page
+            if include_total:
+                pagination["total_items"] = self._resolve_total(
+                    total_key, page, page_size, len(enrollments), has_more, window_total,
+                    lambda: self.course_repo.get_user_courses_count(user_id, search),
+                    "Failed to retrieve user courses count"
+                )
 
         return {
-            "detail": "User courses fetched successfully",
+            "detail": "User courses fetched successfully" if enrollments else "No courses found for the user",
             "data": courses_response,
-            "pagination": {
-                "page": page,
-                "page_size": page_size,
-                "total_items": total_count
-            }
+            "pagination": pagination
         }
 
-
-
-
-
     def getEnrolledUsers(
         self,
         course_id: str,
@@ -395,10 +526,16 @@ class CourseService:
         day: Optional[int]      = None,
         page: Optional[int]     = None,
         page_size: Optional[int] = None,
+        cursor: Optional[str]   = None,
+        include_total: bool     = False,
     ):
         """
         Retrieve enrollments (not user info) for a course,
         filtered by created_at date and optionally paginated.
+
+        With a cursor from a previous page (and page_size), the next page is
+        located by keyset instead of page number. Totals are only counted for
+        offset pages when include_total is set.
         """
         if not course_id:
             raise ValidationError(detail="Course ID is required")
@@ -407,32 +544,76 @@ class CourseService:
         if not self.checkAdminOrOwner(user_id, course_id):
             raise ValidationError(detail="You are not authorized to view this course")
 
-        enrollments, err = self.course_repo.get_enrolled_users(
+        after = parse_cursor(cursor)
+        if after is not None and page_size is None:
+            raise ValidationError(detail="page_size is required with a cursor")
+
+        total_key = ("enrolled_users", str(course_id), year, month, week, day)
+        result, err = self.course_repo.get_enrolled_users(
             course_id=course_id,
             year=year, month=month, week=week, day=day,
-            page=page, page_size=page_size
+            page=page, page_size=page_size, after=after,
+            with_total=self._needs_total(total_key, include_total, after)
         )
         if err:
             raise ValidationError(detail="Failed to retrieve enrolled users", data=str(err))
+        enrollments, window_total = result
 
-        data = [EnrollmentResponse.model_validate(e) for e in enrollments]
+        # unpaginated exports can be large, stream them row by row
+        if after is None and (page is None or page_size is None):
+            return StreamingResponse(
+                self._stream_enrollments("Course enrollments fetched successfully", enrollments),
+                media_type="application/json"
+            )
 
-        result = {
+        enrollments, has_more, next_cursor = split_page(
+            enrollments, page_size, lambda enrollment: (enrollment.enrolled_at, enrollment.id))
+        data = [construct_from_orm(EnrollmentResponse, e) for e in enrollments]
+
+        pagination = {
+            "page_size": page_size,
+            "has_more": has_more,
+            "next_cursor": next_cursor
+        }
+        if after is None:
+            pagination["page"] = page
+            if include_total:
+                pagination["total_items"] = self._resolve_total(
+                    total_key, page, page_size, len(enrollments), has_more, window_total,
+                    lambda: self.course_repo.get_enrolled_users_count_with_date_filter(
+                        course_id, year=year, month=month, week=week, day=day
+                    ),
+                    "Failed to retrieve enrolled users count"
+                )
+
+        return {
             "detail": "Course enrollments fetched successfully",
-            "data": data
+            "data": data,
+            "pagination": pagination
         }
-        # only include pagination if requested
-        if page is not None and page_size is not None:
-            total, err = self.course_repo.get_enrolled_users_count(course_id)
-            if err:
-                raise ValidationError(detail="Failed to retrieve enrolled users count", data=str(err))
-            result["pagination"] = {
-                "page": page,
-                "page_size": page_size,
-                "total_items": total
-            }
 
-        return result
+    def _stream_enrollments(self, detail: str, enrollments):
+        """
+        Yield a `{"detail", "data"}` JSON document one enrollment at a time.
+
+        Args:
+            detail (str): The response detail message.
+            enrollments: Iterable of Enrollment objects or column rows, possibly a lazy query.
+
+        Yields:
+            str: Chunks of the JSON response body.
+        """
+        try:
+            yield '{"detail": ' + json.dumps(detail) + ', "data": ['
+            for index, enrollment in enumerate(enrollments):
+                if index:
+                    yield ","
+                yield construct_from_orm(EnrollmentResponse, enrollment).model_dump_json()
+            yield "]}"
+        finally:
+            # get_db has already closed the session by the time the body is
+            # sent, so a lazy query checks out a fresh connection; release it
+            self.db.close()
 
     def get_courses_analysis(
         self,
@@ -458,12 +639,15 @@ class CourseService:
         if not course_id:
             raise ValidationError(detail="Course ID is required")
 
-        analysis_data, err = self.course_repo.course_analysis(
-            course_id=course_id,
-            year=year,
-            month=month,
-            week=week,
-            day=day
+        analysis_data, err = analysis_cache.get_or_load(
+            (str(course_id), year, month, week, day),
+            lambda: self.course_repo.course_analysis(
+                course_id=course_id,
+                year=year,
+                month=month,
+                week=week,
+                day=day
+            )
         )
         if err:
             raise ValidationError(detail="Failed to retrieve course analysis", data=str(err))
@@ -617,17 +801,11 @@ class CourseService:
         if not instructor_id:
             raise ValidationError(detail="Instructor ID is required")
 
-        user, err = self.user_repo.get_user_by_id(instructor_id)
-        if err:
-            if isinstance(err, NotFoundError):
-                raise ValidationError(detail="Instructor not found")
-            raise ValidationError(detail="Failed to retrieve instructor", data=str(err))
-        if not user or not user.role == "instructor":
-            raise ValidationError(detail="Invalid instructor ID or not an instructor")
-
-        courses, err = self.course_repo.get_courses_by_instructor(instructor_id)
+        courses, err = self.course_repo.get_courses_by_valid_instructor(instructor_id)
         if err:
             raise ValidationError(detail="Failed to retrieve instructor courses", data=str(err))
+        if courses is None:
+            raise ValidationError(detail="Invalid instructor ID or not an instructor")
 
         return {
             "detail": "Instructor courses fetched successfully",
@@ -645,11 +823,10 @@ class CourseService:
         if not course_id:
             raise ValidationError(detail="Course ID is required")
 
-        enrollment, err = self.course_repo.get_enrollment(str(user_id), course_id)
+        enrolled, err = self.course_repo.enrollment_exists(str(user_id), course_id)
         if err:
             raise ValidationError(detail="Failed to check enrollment status", data=str(err))
 
-        enrolled = bool(enrollment)
         return {
             "detail": "Enrollment status fetched successfully",
             "data": {"is_enrolled": enrolled}
@@ -683,12 +860,8 @@ class CourseService:
 
         # If instructor_id is being updated, validate the new instructor
         if hasattr(course_info, 'instructor_id') and course_info.instructor_id is not None:
-            instructor, err = self.user_repo.get_user_by_id(str(course_info.instructor_id))
-            if err:
-                if isinstance(err, NotFoundError):
-                    raise ValidationError(detail="Instructor not found")
-                raise ValidationError(detail="Failed to retrieve instructor", data=str(err))
-            if not instructor or instructor.role != "instructor":
+            role = self._get_user_role(str(course_info.instructor_id))
+            if role != "instructor":
                 raise ValidationError(detail="Invalid instructor ID or not an instructor")
 
         # Convert course_info to dict, excluding None values
@@ -700,15 +873,14 @@ class CourseService:
             raise ValidationError(detail="Failed to update course", data=str(err))
         if not updated_course:
             raise ValidationError(detail="Failed to update course")
-
-        # Get the updated course with lessons for the response
-        updated_course_with_lessons, err = self.course_repo.get_course_with_lessons(course_id)
-        if err:
-            raise ValidationError(detail="Failed to fetch updated course", data=str(err))
-        if not updated_course_with_lessons:
-            raise ValidationError(detail="Failed to fetch updated course")
-
-        course_response = CourseResponse.model_validate(updated_course_with_lessons)
+        course_cache.pop(str(course_id))
+        if "instructor_id" in course_data:
+            # ownership may have moved; cheaper to drop every entry than find this course's
+            owner_cache.clear()
+            lesson_access_cache.clear()
+
+        # update_course returns the course with lessons and instructor loaded
+        course_response = _with_discount(CourseResponse.model_validate(updated_course))
         return {
             "detail": "Course updated successfully",
             "data": course_response
@@ -731,7 +903,7 @@ class CourseService:
             raise ValidationError(detail="Course ID is required")
 
         # First get the course to ensure it exists and to return its data
-        course, err = self.course_repo.get_course(course_id)
+        course, err = self.course_repo.get_course_with_lessons(course_id)
         if err:
             if isinstance(err, NotFoundError):
                 raise ValidationError(detail="Course not found")
@@ -739,14 +911,19 @@ class CourseService:
         if not course:
             raise ValidationError(detail="Course not found")
 
+        # Serialize before deleting; the row can't be refreshed after the commit
+        course_response = _with_discount(CourseResponse.model_validate(course))
+
         # Delete the course
         deleted_course, err = self.course_repo.delete_course(course_id)
         if err:
             raise ValidationError(detail="Failed to delete course", data=str(err))
         if not deleted_course:
             raise ValidationError(detail="Failed to delete course")
+        owner_cache.clear()
+        lesson_access_cache.clear()
+        course_cache.pop(str(course_id))
 
-        course_response = CourseResponse.model_validate(course)
         return {
             "detail": "Course deleted successfully",
             "data": course_response
@@ -759,11 +936,8 @@ class CourseService:
         enrollments, err = self.course_repo.get_instructor_enrollments(instructor_id, days)
         if err:
             raise ValidationError(detail="Failed to fetch instructor enrollments", data=str(err))
-        items = []
-        for enrollment in enrollments:
-            user_schema = UserResponse.model_validate(enrollment.user)
-            course_schema = CourseResponse.model_validate(enrollment.course)
-            items.append(InstructorEnrollmentItem(user=user_schema, course=course_schema, enrolled_at=enrollment.enrolled_at))
+        # enrollments carry user, course and enrolled_at, so the list validates in one call
+        items = ta(List[InstructorEnrollmentItem]).validate_python(enrollments, from_attributes=True)
         return {"detail": "Instructor enrollments fetched successfully", "data": items}
 
 
@@ -1,25 +1,62 @@
+import uuid
+from functools import cached_property
 from app.utils.exceptions.exceptions import ValidationError, NotFoundError
 from app.domain.schema.courseSchema import (
     LessonResponse,
+    LessonInput,
     VideoInput,
     videoResponse,
-    MultipleLessonInput,
 )
-from app.domain.model.course import Lesson, Video
 from app.repository.lesson_repo import LessonRepository
 from app.repository.courseRepo import CourseRepository
-from app.repository.userRepo import UserRepository
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
+from typing import Optional
 from fastapi import Depends
 from app.core.config.database import get_db
-from app.utils.bunny.bunny import generate_secure_bunny_stream_url, encrypt_secret_key, decrypt_secret_key
+from app.utils.cache.ttl_cache import TTLCache
+from app.utils.helper import construct_from_orm
+from app.utils.bunny.bunny import generate_secure_bunny_stream_url_for_encrypted_key, encrypt_secret_key, encrypt_secret_keys
+
+# Pagination totals are only informational, so a short staleness window is fine
+lessons_count_cache = TTLCache(ttl=30, maxsize=4096)
+# (user_id, course_id) -> access row, only for users who were granted access.
+# Nothing revokes an enrollment short of deleting the user or course, so
+# grants are only dropped on role, instructor and delete changes
+lesson_access_cache = TTLCache(ttl=60, maxsize=10_000)
+# course_id -> CourseResponse served by CourseService.getCourse; kept here so
+# lesson and video writes can drop entries without importing CourseService
+course_cache = TTLCache(ttl=60, maxsize=1024)
+# Input fields copied straight into ORM rows; plain getattr is cheaper than model_dump
+_LESSON_INPUT_FIELDS = tuple(name for name in LessonInput.model_fields if name != 'video')
+_VIDEO_INPUT_FIELDS = tuple(VideoInput.model_fields)
+
+def _video_response(video):
+    return construct_from_orm(videoResponse, video)
+
+def _lesson_response(lesson):
+    # Lessons have no video_url column; it is only filled in for playback
+    video = lesson.video
+    return construct_from_orm(
+        LessonResponse, lesson,
+        video_url=None,
+        video=_video_response(video) if video else None
+    )
 
 class LessonService:
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, course_repo: Optional[CourseRepository] = None):
+        self.db = db
         self.lesson_repo = LessonRepository(db)
-        self.course_repo = CourseRepository(db)
-        self.user_repo = UserRepository(db)
+        # (user_id, course_id) pairs already granted during this request
+        self._access_granted = set()
+        # Callers that already hold a CourseRepository for this session can share it
+        if course_repo is not None:
+            self.course_repo = course_repo
+
+    # Only the lesson access checks need it
+    @cached_property
+    def course_repo(self) -> CourseRepository:
+        return CourseRepository(self.db)
 
     def check_lesson_access(self, course_id, user_id):
         """
@@ -35,33 +72,46 @@ class LessonService:
         Raises:
             ValidationError: If the user is not found or not enrolled in the course.
         """
-        user, err = self.user_repo.get_user_by_id(user_id)
+        key = (str(user_id), str(course_id))
+        if key in self._access_granted:
+            return True
+        access = lesson_access_cache.get(key)
+        if access is not None:
+            self._access_granted.add(key)
+            return True
+
+        access, err = self.course_repo.get_lesson_access(course_id, user_id)
         if err:
-            if isinstance(err, NotFoundError):
-                raise ValidationError(detail="User not found")
-            raise ValidationError(detail="Failed to retrieve user", data=str(err))
-        if not user:
+            raise ValidationError(detail="Failed to check lesson access", data=str(err))
+        allowed = self._authorize_lesson_access(access)
+        lesson_access_cache.set(key, access)
+        self._access_granted.add(key)
+        return allowed
+
+    @staticmethod
+    def _authorize_lesson_access(access):
+        """
+        Decide lesson access from a `(role, is_enrolled, owns_course)` row.
+
+        Raises:
+            ValidationError: If the user is not found or not enrolled in the course.
+        """
+        if not access or access.role is None:
             raise ValidationError(detail="User not found")
 
-        # Check if user is enrolled in course
-        enrollment, err = self.course_repo.get_enrollment(user_id, course_id)
-        if err:
-            raise ValidationError(detail="Failed to check enrollment", data=str(err))
         # Allow access if user is admin
-        if user.role == "admin":
+        if access.role == "admin":
             return True
 
         # Allow access if user is instructor and owns the course
-        if user.role == "instructor":
-            course_instructor_id, err = self.course_repo.course_instructor(course_id)
-            print(f"Course Instructor ID: {course_instructor_id}, User ID: {user.id}")
-            if str(course_instructor_id) == str(user.id):
+        if access.role == "instructor":
+            if access.owns_course:
                 return True
             else:
                 raise ValidationError(detail="Instructor does not own this course")
 
         # For students, check enrollment
-        if not enrollment:
+        if not access.is_enrolled:
             raise ValidationError(detail="User not enrolled in course")
         return True
 
@@ -80,18 +130,29 @@ class LessonService:
         """
         self.check_lesson_access(course_id, user_id )
 
-        lessons, err = self.lesson_repo.get_lessons(course_id, page, page_size)
+        # Count in the page query unless a recent total is cached
+        key = str(course_id)
+        total_count = lessons_count_cache.get(key)
+        result, err = self.lesson_repo.get_lessons(course_id, page, page_size, with_total=total_count is None)
         if err:
             raise ValidationError(detail="Failed to retrieve lessons", data=str(err))
-
-        lessons_response = [
-            LessonResponse.model_validate(lesson)
-            for lesson in lessons
-        ]
-
-        total_count, err = self.lesson_repo.get_lessons_count(course_id)
-        if err:
-            raise ValidationError(detail="Failed to retrieve lessons count", data=str(err))
+        if result is None:
+            raise ValidationError(detail="Course not found")
+        lessons, window_total = result
+
+        lessons_response = [_lesson_response(lesson) for lesson in lessons]
+
+        if window_total is not None:
+            total_count = window_total
+            lessons_count_cache.set(key, total_count)
+        elif total_count is None:
+            # Empty page: the window function had no row to report on
+            total_count, err = lessons_count_cache.get_or_load(
+                key,
+                lambda: self.lesson_repo.get_lessons_count(course_id)
+            )
+            if err:
+                raise ValidationError(detail="Failed to retrieve lessons count", data=str(err))
 
         return {
             "detail": "Lessons fetched successfully",
@@ -124,37 +185,39 @@ class LessonService:
         if not lesson_id:
             raise ValidationError(detail="Lesson ID is required")
 
-        lesson, err = self.lesson_repo.get_lesson_by_id(course_id, lesson_id)
-        print(f"Lesson order: {lesson.order}, Error: {err}")
-        if lesson.order != 1:
-            self.check_lesson_access(course_id, user_id)
-
+        # The access checks ride along on the lesson query
+        result, err = self.lesson_repo.get_lesson_with_access(course_id, lesson_id, user_id)
         if err:
             if isinstance(err, NotFoundError):
                 raise ValidationError(detail="Lesson not found")
             raise ValidationError(detail="Failed to retrieve lesson", data=str(err))
-        if not lesson:
+        if not result:
             raise ValidationError(detail="Lesson not found")
+        lesson, access = result
 
-        lesson_response = LessonResponse.model_validate(lesson)
-
-        video, err = self.lesson_repo.get_lesson_video(lesson_id)
-        if err:
-            raise ValidationError(detail="Failed to retrieve lesson video", data=str(err))
+        # The first lesson is a free preview; everything else is authorized
+        # before any key is decrypted or URL signed
+        if lesson.order != 1:
+            self._authorize_lesson_access(access)
+            # share the grant with check_lesson_access for this course's lesson list
+            key = (str(user_id), str(course_id))
+            lesson_access_cache.set(key, access)
+            self._access_granted.add(key)
 
-        if video:
-            video_response = videoResponse.model_validate(video)
-            library_id, video_id, secret_key = video_response.library_id, video_response.video_id, video_response.secret_key
+        lesson_response = _lesson_response(lesson)
 
-            if secret_key:
-                try:
-                    secret_key = decrypt_secret_key(secret_key)
-                except Exception as e:
-                    raise ValidationError(detail=f"Failed to decrypt video secret key: {str(e)}")
-            else:
+        video_response = lesson_response.video
+        if video_response:
+            if not video_response.secret_key:
                 raise ValidationError(detail="Video secret key not found")
-
-            url = generate_secure_bunny_stream_url(library_id, video_id, secret_key)
+            try:
+                url = generate_secure_bunny_stream_url_for_encrypted_key(
+                    video_response.library_id,
+                    video_response.video_id,
+                    video_response.secret_key
+                )
+            except Exception as e:
+                raise ValidationError(detail=f"Failed to decrypt video secret key: {str(e)}")
             lesson_response.video_url = url
 
         return {
@@ -176,29 +239,59 @@ class LessonService:
         Raises:
             ValidationError: If the course ID is not provided or adding a lesson fails.
         """
-        if not course_id:
-            raise ValidationError(detail="Course ID is required")
+        created_lessons = self.create_lessons(course_id, lessons_input)
+        return [_lesson_response(lesson) for lesson in created_lessons]
 
-        lessons_responses = []
-        for lesson in lessons_input:
-            lesson_data = Lesson(**lesson.model_dump(exclude={'video'}))
-            lesson_data.course_id = course_id
+    def create_lessons(self, course_id: str, lessons_input, check_course: bool = True):
+        """
+        Create lessons (and their videos) for a course.
 
-            created_lesson, err = self.lesson_repo.add_lesson(course_id, lesson_data)
-            if err:
-                if isinstance(err, IntegrityError):
-                    raise ValidationError(detail=f"Failed to add lesson, {str(err)}")
-                raise ValidationError(detail="Failed to add lesson", data=str(err))
-            if not created_lesson:
-                raise ValidationError(detail="Failed to add lesson")
+        Args:
+            course_id (str): The course ID.
+            lessons_input: The lessons input.
+            check_course (bool): Whether to check the course exists first.
+
+        Returns:
+            List[Lesson]: The created lesson objects, with their videos loaded.
+
+        Raises:
+            ValidationError: If the course ID is not provided or adding a lesson fails.
+        """
+        if not course_id:
+            raise ValidationError(detail="Course ID is required")
 
-            lesson_response = LessonResponse.model_validate(created_lesson)
-            lessons_responses.append(lesson_response)
+        # Encrypt every video key in one pass with a single cipher
+        encrypted_keys = iter(encrypt_secret_keys(
+            [lesson.video.secret_key for lesson in lessons_input if lesson.video]
+        ))
 
+        # Ids are generated here so both tables can be inserted in one batch each
+        lessons, videos = [], []
+        for lesson in lessons_input:
+            lesson_id = uuid.uuid4()
+            lessons.append({
+                **{name: getattr(lesson, name) for name in _LESSON_INPUT_FIELDS},
+                "id": lesson_id,
+                "course_id": course_id,
+            })
             if lesson.video:
-                self.add_video_to_lesson_helper(course_id, created_lesson.id, lesson.video)
+                videos.append({
+                    **{name: getattr(lesson.video, name) for name in _VIDEO_INPUT_FIELDS},
+                    "id": uuid.uuid4(),
+                    "lesson_id": lesson_id,
+                    "secret_key": next(encrypted_keys),
+                })
+
+        created_lessons, err = self.lesson_repo.add_multiple_lessons(course_id, lessons, videos, check_course=check_course)
+        if err:
+            if isinstance(err, IntegrityError):
+                raise ValidationError(detail=f"Failed to add lesson, {str(err)}")
+            raise ValidationError(detail="Failed to add lesson", data=str(err))
+        if created_lessons is None:
+            raise ValidationError(detail="Course not found")
+        course_cache.pop(str(course_id))
 
-        return lessons_responses
+        return created_lessons
 
     def add_multiple_lessons(self, course_id: str, lessons_input):
         """
@@ -231,28 +324,18 @@ class LessonService:
         Raises:
             ValidationError: If the lesson is not found or adding the video fails.
         """
-        # Get lesson and check if available
-        lesson, err = self.lesson_repo.get_lesson_by_id(course_id, lesson_id)
-        if err:
-            if isinstance(err, NotFoundError):
-                raise ValidationError(detail="Lesson not found")
-            raise ValidationError(detail="Failed to retrieve lesson", data=str(err))
-        if not lesson:
-            raise ValidationError(detail="Lesson not found")
+        video_data = {name: getattr(video_input, name) for name in _VIDEO_INPUT_FIELDS}
+        video_data["secret_key"] = encrypt_secret_key(video_input.secret_key)
 
-        # Create video
-        video_input.secret_key = encrypt_secret_key(video_input.secret_key)
-        video_data = video_input.model_dump()
-        video = Video(**video_data, lesson_id=lesson_id)
-
-        # Add video to lesson
-        created_video, err = self.lesson_repo.add_video(video)
+        # Checks the lesson and inserts the video without reading either back
+        created_video, err = self.lesson_repo.add_video_to_lesson(course_id, lesson_id, video_data)
         if err:
             if isinstance(err, IntegrityError):
                 raise ValidationError(detail="Failed to add video, video already exists")
             raise ValidationError(detail="Failed to add video", data=str(err))
         if not created_video:
-            raise ValidationError(detail="Failed to add video")
+            raise ValidationError(detail="Lesson not found")
+        course_cache.pop(str(course_id))
 
         return created_video
 
@@ -271,20 +354,21 @@ class LessonService:
         created_video = self.add_video_to_lesson_helper(course_id, lesson_id, video_input)
         return {
             "detail": "Video added successfully",
-            "data": created_video
+            "data": _video_response(created_video)
         }
 
-    def get_lesson_video(self, lesson_id: str):
+    def get_lesson_video(self, course_id: str, lesson_id: str):
         """
         Get the video for a lesson.
 
         Args:
+            course_id (str): The course ID.
             lesson_id (str): The lesson ID.
 
         Returns:
             dict: The video response.
         """
-        video, err = self.lesson_repo.get_lesson_video(lesson_id)
+        video, err = self.lesson_repo.get_lesson_video(course_id, lesson_id)
         if err:
             raise ValidationError(detail="Failed to retrieve lesson video", data=str(err))
         if not video:
@@ -295,7 +379,7 @@ class LessonService:
 
         return {
             "detail": "Video fetched successfully",
-            "data": videoResponse.model_validate(video)
+            "data": _video_response(video)
         }
 
     def edit_lesson(self, course_id: str, lesson_id: str, lesson_data: dict):
@@ -316,11 +400,12 @@ class LessonService:
                 raise ValidationError(detail="Lesson not found")
             raise ValidationError(detail="Failed to update lesson", data=str(err))
         if not updated_lesson:
-            raise ValidationError(detail="Failed to update lesson")
+            raise ValidationError(detail="Lesson not found")
+        course_cache.pop(str(course_id))
 
         return {
             "detail": "Lesson updated successfully",
-            "data": LessonResponse.model_validate(updated_lesson)
+            "data": _lesson_response(updated_lesson)
         }
 
     def delete_lesson(self, course_id: str, lesson_id: str):
@@ -341,10 +426,11 @@ class LessonService:
             raise ValidationError(detail="Failed to delete lesson", data=str(err))
         if not deleted_lesson:
             raise ValidationError(detail="Failed to delete lesson")
+        course_cache.pop(str(course_id))
 
         return {
             "detail": "Lesson deleted successfully",
-            "data": LessonResponse.model_validate(deleted_lesson)
+            "data": _lesson_response(deleted_lesson)
         }
 
     def delete_video(self, video_id: str):
@@ -357,13 +443,6 @@ class LessonService:
         Returns:
             dict: The video deletion response.
         """
-        # First get the video to ensure it exists
-        video, err = self.lesson_repo.get_lesson_video_by_id(video_id)
-        if err:
-            raise ValidationError(detail="Failed to retrieve video", data=str(err))
-        if not video:
-            raise ValidationError(detail="Video not found")
-
         # Delete the video
         deleted_video, err = self.lesson_repo.delete_video(video_id)
         if err:
@@ -371,11 +450,13 @@ class LessonService:
                 raise ValidationError(detail="Video not found")
             raise ValidationError(detail="Failed to delete video", data=str(err))
         if not deleted_video:
-            raise ValidationError(detail="Failed to delete video")
+            raise ValidationError(detail="Video not found")
+        # only the video id is known here, so drop every cached course
+        course_cache.clear()
 
         return {
             "detail": "Video deleted successfully",
-            "data": videoResponse.model_validate(deleted_video)
+            "data": _video_response(deleted_video)
         }
 
     def edit_video(self, video_id: str, video_input: VideoInput):
@@ -389,30 +470,26 @@ class LessonService:
         Returns:
             dict: The video update response.
         """
-        # First get the video to ensure it exists
-        video, err = self.lesson_repo.get_lesson_video_by_id(video_id)
-        if err:
-            raise ValidationError(detail="Failed to retrieve video", data=str(err))
-        if not video:
-            raise ValidationError(detail="Video not found")
+        # Only the fields the client sent, read straight off the model
+        video_data = {name: getattr(video_input, name) for name in video_input.model_fields_set}
 
         # Encrypt the secret key if provided
-        if video_input.secret_key:
-            video_input.secret_key = encrypt_secret_key(video_input.secret_key)
+        if video_data.get("secret_key"):
+            video_data["secret_key"] = encrypt_secret_key(video_data["secret_key"])
 
         # Update the video
-        video_data = video_input.model_dump(exclude_unset=True)
         updated_video, err = self.lesson_repo.edit_video(video_id, video_data)
         if err:
             if isinstance(err, NotFoundError):
                 raise ValidationError(detail="Video not found")
             raise ValidationError(detail="Failed to update video", data=str(err))
         if not updated_video:
-            raise ValidationError(detail="Failed to update video")
+            raise ValidationError(detail="Video not found")
+        course_cache.clear()
 
         return {
             "detail": "Video updated successfully",
-            "data": videoResponse.model_validate(updated_video)
+            "data": _video_response(updated_video)
         }
 
     def get_video_by_id(self, video_id: str):
@@ -431,16 +508,15 @@ class LessonService:
         if not video:
             raise ValidationError(detail="Video not found")
 
-        video_response = videoResponse.model_validate(video)
+        video_response = _video_response(video)
 
         # If the video has a secret key, generate a secure URL
         if video_response.secret_key:
             try:
-                decrypted_key = decrypt_secret_key(video_response.secret_key)
-                url = generate_secure_bunny_stream_url(
+                url = generate_secure_bunny_stream_url_for_encrypted_key(
                     video_response.library_id,
                     video_response.video_id,
-                    decrypted_key
+                    video_response.secret_key
                 )
                 video_response.video_url = url
             except Exception as e:
@@ -3,25 +3,57 @@ from app.domain.schema.courseSchema import (
     PaymentData,
     PaymentResponse,
     CallbackPayload,
+    EnrollmentResponse,
 )
 from app.domain.model.course import Payment
 from app.repository.payment_repo import PaymentRepository
 from app.repository.courseRepo import CourseRepository
 from app.repository.userRepo import UserRepository
 from sqlalchemy.orm import Session
-from fastapi import Depends
+from fastapi import Depends, BackgroundTasks
 from app.core.config.database import get_db
 from typing import Optional
 from app.utils.chapa.chapa import pay_course, verify_payment, generete_tx_ref
-from app.domain.schema.courseSchema import EnrollmentResponse
 from app.core.config.env import get_settings
 from app.utils.otp.sms import send_sms
+import logging
+from functools import cached_property
+from app.utils.helper import as_uuid, construct_from_orm
+from app.utils.cache.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
 settings = get_settings()
+
+# Successful Chapa verifications by tx_ref, so repeated callbacks for the
+# same transaction don't ask Chapa again
+verify_cache = TTLCache(ttl=60, maxsize=10_000)
+
+def _send_enrollment_sms(phone_number: str, course_title: str):
+    try:
+        message = f"You have successfully enrolled in {course_title}. Thank you for choosing our platform!"
+        logger.debug("Sending enrollment SMS for course %s", course_title)
+        send_sms(phone_number, message)
+    except Exception as e:
+        logger.warning("Error sending enrollment SMS for course %s: %s", course_title, e)
+
 class PaymentService:
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, course_repo: Optional[CourseRepository] = None, user_repo: Optional[UserRepository] = None):
+        self.db = db
         self.payment_repo = PaymentRepository(db)
-        self.course_repo = CourseRepository(db)
-        self.user_repo = UserRepository(db)
+        # Callers that already hold repositories for this session can share them
+        if course_repo is not None:
+            self.course_repo = course_repo
+        if user_repo is not None:
+            self.user_repo = user_repo
+
+    # Most calls use at most one of these, so each is only built on first use
+    @cached_property
+    def course_repo(self) -> CourseRepository:
+        return CourseRepository(self.db)
+
+    @cached_property
+    def user_repo(self) -> UserRepository:
+        return UserRepository(self.db)
 
     def initiate_payment(self, user_id, course_id):
         """
@@ -47,28 +79,20 @@ class PaymentService:
         # validate if user is not admin
         if user.role == "admin":
             raise ValidationError(detail="Admins cannot enroll in courses")
-        # Validate course exists
-        course, err = self.course_repo.get_course(course_id)
+        # Validate course exists and user is not already enrolled in one query
+        course, err = self.course_repo.get_course_checkout(course_id, user_id)
         if err:
             raise ValidationError(detail="Error fetching course", data=str(err))
         if not course:
             raise NotFoundError(detail="Course not found")
-
-        # Check if user is already enrolled
-        enrollment, err = self.course_repo.get_enrollment(user_id, course_id)
-        if err:
-            raise ValidationError(detail="Error fetching enrollment", data=str(err))
-        if enrollment:
+        if course.is_enrolled:
             raise ValidationError(detail="User already enrolled in course")
 
-        if course.price > 0:
+        if course.net_price > 0:
             callback = f"{settings.BASE_URL}/payment/callback"
 
             tx_ref = generete_tx_ref(12)
-            if course.discount:
-                amount = course.price - ((course.discount/100) * course.price)
-            else:
-                amount = course.price
+            amount = course.net_price
 
             data = PaymentData(
                 tx_ref=tx_ref,
@@ -81,7 +105,6 @@ class PaymentService:
                 callback_url=callback,
                 phone_number="0"+user.phone_number
             )
-            print("Payment data:", data)
             try:
                 response = pay_course(data)
             except Exception as e:
@@ -96,17 +119,17 @@ class PaymentService:
                 amount=amount,
                 tx_ref=tx_ref
             )
-            print("Payment object:", payment)
 
             payment, err = self.payment_repo.save_payment(payment)
             if err:
                 raise ValidationError(detail="Error saving payment", data=str(err))
 
-            return {"detail": "Payment initiated", "data": {"payment": PaymentResponse.model_validate(payment), "chapa_response": response}}
+            return {"detail": "Payment initiated", "data": {"payment": construct_from_orm(PaymentResponse, payment), "chapa_response": response}}
 
         else:
             # Enroll course for free
-            enrollment,err = self.course_repo.enroll_course(user_id, course_id)
+            # The course was loaded above, so skip the existence check
+            enrollment,err = self.course_repo.enroll_course(user_id, course_id, check_course=False)
             if err:
                 raise ValidationError(detail="Error enrolling course", data=str(err))
             if not enrollment:
@@ -114,16 +137,18 @@ class PaymentService:
             # Check if user is already enrolled
 
             # Convert SQLAlchemy Enrollment object to Pydantic Response Model
-            enrollment_response = EnrollmentResponse.model_validate(enrollment)
+            enrollment_response = construct_from_orm(EnrollmentResponse, enrollment)
 
             return {"detail": "Course enrolled successfully", "data": enrollment_response}
 
-    def process_payment_callback(self, payload: CallbackPayload):
+    def process_payment_callback(self, payload: CallbackPayload, background_tasks: Optional[BackgroundTasks] = None):
         """
         Process a payment callback.
 
         Args:
             payload (CallbackPayload): The callback payload.
+            background_tasks (Optional[BackgroundTasks]): Where to queue the
+                enrollment SMS; it is sent inline when not given.
 
         Returns:
             dict: The enrollment response.
@@ -131,18 +156,31 @@ class PaymentService:
         Raises:
             ValidationError: If the payment fails.
         """
-        # Validate payment exists
-        payment, err = self.payment_repo.get_payment(payload.trx_ref)
+        # Validate payment exists, loading its user and course in the same query
+        payment, err = self.payment_repo.get_payment_with_user_course(payload.trx_ref)
         if err:
             raise ValidationError(detail="Error fetching payment", data=str(err))
         if not payment:
             raise NotFoundError(detail="Payment not found")
 
-        # Verify payment with payment provider
-        try:
-            response = verify_payment(payload.trx_ref)
-        except Exception as e:
-            raise ValidationError(detail="Payment verification failed")
+        # Validate user and course exist
+        user, course = payment.user, payment.course
+        if not user:
+            raise NotFoundError(detail="User not found")
+        if not course:
+            raise NotFoundError(detail="Course not found")
+
+        # Verify payment with payment provider, only once the tx_ref is known to
+        # be ours and unless a callback for it was already verified
+        response = verify_cache.get(payload.trx_ref)
+        if response is None:
+            try:
+                response = verify_payment(payload.trx_ref)
+            except Exception as e:
+                raise ValidationError(detail="Payment verification failed")
+            # Only a success is final; anything else is asked again next time
+            if response.get("status") == "success":
+                verify_cache.set(payload.trx_ref, response)
 
         if response["status"] != "success":
             _, err = self.payment_repo.update_payment(payload.trx_ref, "failed", ref_id=payload.ref_id)
@@ -150,48 +188,43 @@ class PaymentService:
                 raise ValidationError(detail="Error updating payment status to failed", data=str(err))
             raise ValidationError(detail="Payment failed")
 
-        # Update payment status
+        # Read what we need before the status commit expires the loaded objects
+        user_id, course_id, course_title = user.id, course.id, course.title
+        phone_number = f"0{user.phone_number}"
+        already_settled = payment.status == "success"
 
-        payment, err = self.payment_repo.update_payment(payload.trx_ref, "success", ref_id=response["data"]["reference"])
+        # Update payment status
+        _, err = self.payment_repo.update_payment(payload.trx_ref, "success", ref_id=response["data"]["reference"])
         if err:
             raise ValidationError(detail="Error updating payment status to success", data=str(err))
-        payment = PaymentResponse.model_validate(payment)
-
-        # Validate user exists
-        user, err = self.user_repo.get_user_by_id(payment.user_id)
-        if err:
-            raise ValidationError(detail="Error fetching user after payment", data=str(err))
-        if not user:
-            raise NotFoundError(detail="User not found")
-
-        # Validate course exists
-        course,err = self.course_repo.get_course(payment.course_id)
-        if err:
-            raise ValidationError(detail="Error fetching course after payment", data=str(err))
 
-        if not course:
-            raise NotFoundError(detail="Course not found")
+        # A replayed callback for a settled payment returns the enrollment it
+        # already made instead of enrolling and texting the user again
+        if already_settled:
+            enrollment, err = self.course_repo.get_enrollment(user_id, course_id)
+            if err:
+                raise ValidationError(detail="Error fetching enrollment", data=str(err))
+            if enrollment:
+                enrollment_response = construct_from_orm(EnrollmentResponse, enrollment)
+                return {"detail": "Course enrolled successfully", "data": enrollment_response}
 
         # Enroll course
-        enrollment, err = self.course_repo.enroll_course(user.id, course.id)
-        
-
-        try:
-            message = f"You have successfully enrolled in {course.title}. Thank you for choosing our platform!"
-            phone_number = f"0{user.phone_number}"
-            print("Sending SMS to:", phone_number)
-            print("Message:", message)
-            send_sms(phone_number, message)
-        except Exception as e:
-            print("Error sending SMS:", e)
+        # The course came back with the payment, so skip the existence check
+        enrollment, err = self.course_repo.enroll_course(user_id, course_id, check_course=False)
 
         if err:
             raise ValidationError(detail="Error enrolling course", data=str(err))
         if not enrollment:
             raise ValidationError(detail="Error enrolling course")
 
+        # The response doesn't depend on the SMS, so send it after responding
+        if background_tasks is not None:
+            background_tasks.add_task(_send_enrollment_sms, phone_number, course_title)
+        else:
+            _send_enrollment_sms(phone_number, course_title)
+
         # Convert SQLAlchemy Enrollment object to Pydantic Response Model
-        enrollment_response = EnrollmentResponse.model_validate(enrollment)
+        enrollment_response = construct_from_orm(EnrollmentResponse, enrollment)
 
         return {"detail": "Course enrolled successfully", "data": enrollment_response}
 
@@ -217,23 +250,20 @@ class PaymentService:
         if not user:
             raise NotFoundError(detail="User not found")
 
-        payments, err = self.payment_repo.get_user_payments(
+        # The total comes back with the page when paginating
+        page_result, err = self.payment_repo.get_user_payments(
             user_id, page, page_size, filter, year, month, week, day
         )
         if err:
             raise ValidationError(detail="Error fetching payments", data=str(err))
-        payments_response = [PaymentResponse.model_validate(p) for p in payments]
+        payments, total = page_result
+        payments_response = [construct_from_orm(PaymentResponse, payment) for payment in payments]
 
         result = {
             "detail": "User payments fetched successfully",
             "data": payments_response
         }
-        if page is not None and page_size is not None:
-            total, err = self.payment_repo.get_user_payments_count(
-                user_id, filter, year, month, week, day
-            )
-            if err:
-                raise ValidationError(detail="Error fetching payments count", data=str(err))
+        if total is not None:
             result["pagination"] = {
                 "page": page,
                 "page_size": page_size,
@@ -242,31 +272,20 @@ class PaymentService:
         return result
 
     def checkAdminOrOwner(self, user_id, course_id):
-        user, err = self.user_repo.get_user_by_id(user_id)
+        # Role, course existence and instructor come back from one query
+        context, err = self.course_repo.get_auth_context(user_id, course_id)
         if err:
-            if isinstance(err, NotFoundError):
-                raise ValidationError(detail="User not found")
-            raise ValidationError(detail="Failed to retrieve user", data=str(err))
-        if not user:
+            raise ValidationError(detail="Failed to check course access", data=str(err))
+        if not context:
             raise ValidationError(detail="User not found")
 
-        if user.role == "admin":
+        role, course_found, instructor_id = context
+        if role == "admin":
             return True
-
-        course, err = self.course_repo.get_course(course_id)
-        if err:
-            if isinstance(err, NotFoundError):
-                raise ValidationError(detail="Course not found")
-            raise ValidationError(detail="Failed to retrieve course", data=str(err))
-        if not course:
+        if not course_found:
             raise ValidationError(detail="Course not found")
 
-        print("instructor_id", course.instructor_id)
-        print("user_id", user_id)
-        if str(course.instructor_id) == user_id:
-            return True
-
-        return False
+        return instructor_id == as_uuid(user_id)
 
 
     def get_payment(self, payment_id: str):
@@ -291,7 +310,7 @@ class PaymentService:
         if not payment:
             raise NotFoundError(detail="Payment not found")
 
-        payment_response = PaymentResponse.model_validate(payment)
+        payment_response = construct_from_orm(PaymentResponse, payment)
 
         return {
             "detail": "Payment fetched successfully",
@@ -319,29 +338,27 @@ class PaymentService:
         if not self.checkAdminOrOwner(user_id, course_id):
             raise ValidationError(detail="You are not authorized to view this course")
 
-        payments, err = self.payment_repo.get_course_payments(
+        # The total comes back with the page when paginating
+        page_result, err = self.payment_repo.get_course_payments(
             course_id, page, page_size, filter, year, month, week, day
         )
         if err:
             raise ValidationError(detail="Error fetching course payments", data=str(err))
-        payments_response = [PaymentResponse.model_validate(p) for p in payments]
+        payments, total = page_result
+        payments_response = [construct_from_orm(PaymentResponse, payment) for payment in payments]
 
         result = {
             "detail": "Course payments fetched successfully",
             "data": payments_response
         }
-        if page is not None and page_size is not None:
-            total, err = self.payment_repo.get_course_payments_count(
-                course_id, filter, year, month, week, day
-            )
-            if err:
-                raise ValidationError(detail="Error fetching course payments count", data=str(err))
+        if total is not None:
             result["pagination"] = {
                 "page": page,
                 "page_size": page_size,
                 "total_items": total
             }
         return result
+
 def get_payment_service(db: Session = Depends(get_db)) -> PaymentService:
     """
     Get a PaymentService instance.
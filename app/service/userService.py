@@ -1,15 +1,36 @@
 from app.utils.exceptions.exceptions import ValidationError, DuplicatedError, NotFoundError
-import re
 from app.domain.schema.authSchema import UserResponse, editUser
 from app.domain.model.user import User
 from app.repository.userRepo import UserRepository
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from fastapi import Depends, UploadFile
+from fastapi.concurrency import run_in_threadpool
 from app.core.config.database import get_db
-from typing import Optional
+from typing import Optional, List
 from app.utils.helper import normalize_phone_number
 from app.utils.security.hash import hash_password, verify_password
+from app.utils.cache.ttl_cache import TTLCache
+from app.utils.bunny.bunnyStorage import BunnyCDNStorage
+from app.core.config.env import get_settings
+from app.utils.pydantic_cache import ta
+from app.service.lesson_service import lesson_access_cache
+
+settings = get_settings()
+profile_picture_storage = BunnyCDNStorage(
+    settings.BUNNY_CDN_PROFILE_STORAGE_APIKEY,
+    settings.BUNNY_CDN_PROFILE_STORAGE_ZONE,
+    settings.BUNNY_CDN_PROFILE_PULL_ZONE
+)
+
+# Profile picture content types accepted by upload_profile_picture
+_ALLOWED_IMAGE_TYPES = frozenset({"image/jpeg", "image/png", "image/jpg"})
+
+# user_id -> role, for checks that only need the role; popped on role change or delete
+role_cache = TTLCache(ttl=60, maxsize=10_000)
+# (user_id, course_id) pairs that are an admin or the course's instructor; cleared
+# on role change, user delete and course ownership changes
+owner_cache = TTLCache(ttl=30, maxsize=10_000)
 
 
 #initalize the user service
@@ -33,7 +54,7 @@ class UserService:
         if err:
             raise ValidationError(detail="Failed to retrieve users count", data=str(err))
 
-        users_response = [UserResponse.model_validate(user) for user in users]
+        users_response = ta(List[UserResponse]).validate_python(users, from_attributes=True)
         response = {
             "detail": "Users retrieved successfully",
             "data": users_response,
@@ -124,6 +145,9 @@ class UserService:
         _, err = self.user_repo.delete_user(user_id)
         if err:
             raise ValidationError(detail="Failed to delete user", data=str(err))
+        role_cache.pop(str(user_id))
+        owner_cache.clear()
+        lesson_access_cache.clear()
 
         response = {"detail": "User deleted successfully"}
         return response
@@ -131,6 +155,10 @@ class UserService:
     #update role
     def update_role(self, user_id: str, role: str):
         user, err = self.user_repo.update_role(user_id, role)
+        role_cache.pop(str(user_id))
+        # keys are per course, so drop every grant rather than scan for this user's
+        owner_cache.clear()
+        lesson_access_cache.clear()
         if err:
             if isinstance(err, NotFoundError):
                 raise NotFoundError(detail="User with this id does not exist")
@@ -224,7 +252,7 @@ class UserService:
         if err:
             raise ValidationError(detail="Failed to retrieve instructors count", data=str(err))
 
-        users_response = [UserResponse.model_validate(user) for user in users]
+        users_response = ta(List[UserResponse]).validate_python(users, from_attributes=True)
         response = {
             "detail": "Instructors retrieved successfully",
             "data": users_response,
@@ -248,7 +276,7 @@ class UserService:
         response = {"detail": "Instructor retrieved successfully", "data": user_response}
         return response
 
-    def upload_profile_picture(self, user_id: str, profile_picture: UploadFile):
+    async def upload_profile_picture(self, user_id: str, profile_picture: UploadFile):
         """
         Upload a profile picture for a user.
 
@@ -262,15 +290,12 @@ class UserService:
         Raises:
             ValidationError: If the user ID is invalid or the profile picture upload fails.
         """
-        import os
-        from tempfile import NamedTemporaryFile
-        from app.utils.bunny.bunnyStorage import BunnyCDNStorage
-        from app.core.config.env import get_settings
-
-        settings = get_settings()
+        # Validate image format before touching the database
+        if profile_picture.content_type not in _ALLOWED_IMAGE_TYPES:
+            raise ValidationError(detail="Invalid image format. Only JPEG and PNG are allowed.")
 
         # Validate user exists
-        user, err = self.user_repo.get_user_by_id(user_id)
+        user, err = await run_in_threadpool(self.user_repo.get_user_by_id, user_id)
         if err:
             if isinstance(err, NotFoundError):
                 raise ValidationError(detail="User not found")
@@ -278,18 +303,7 @@ class UserService:
         if not user:
             raise ValidationError(detail="User not found")
 
-        # Validate image format
-        if not re.match(r"^image/(jpeg|png|jpg)$", profile_picture.content_type):
-            raise ValidationError(detail="Invalid image format. Only JPEG and PNG are allowed.")
-
         try:
-            # Initialize BunnyCDN storage
-            storage = BunnyCDNStorage(
-                settings.BUNNY_CDN_PROFILE_STORAGE_APIKEY,
-                settings.BUNNY_CDN_PROFILE_STORAGE_ZONE,
-                settings.BUNNY_CDN_PROFILE_PULL_ZONE
-            )
-
             # Generate filename based on user's name
             name_base = user.first_name
             if user.last_name:
@@ -301,30 +315,18 @@ class UserService:
             if original_filename and "." in original_filename:
                 original_extension = "." + original_filename.split(".")[-1]
 
-            # Create a temporary file with the original content
-            with NamedTemporaryFile("wb", delete=False) as tmp:
-                tmp.write(profile_picture.file.read())
-                tmp_path = tmp.name
-
-            # Create a temporary file with the correct extension to help BunnyCDN detect the file type
-            temp_file_with_ext = f"{tmp_path}{original_extension}"
-            import shutil
-            shutil.copy(tmp_path, temp_file_with_ext)
-
-            # Upload and then remove temp files
+            # Stream the upload without blocking the event loop
             # The BunnyCDNStorage class will handle making the filename unique
-            profile_picture_url = storage.upload_file(
+            await profile_picture.seek(0)
+            profile_picture_url = await profile_picture_storage.upload_stream_async(
                 "",
-                file_path=temp_file_with_ext,
-                file_name=name_base
+                profile_picture,
+                file_name=name_base,
+                extension=original_extension
             )
 
-            # Clean up temporary files
-            os.unlink(temp_file_with_ext)
-            os.unlink(tmp_path)
-
             # Update user's profile picture URL
-            _, err = self.user_repo.update_profile_picture(user_id, profile_picture_url)
+            _, err = await run_in_threadpool(self.user_repo.update_profile_picture, user_id, profile_picture_url)
             if err:
                 raise ValidationError(detail="Failed to update profile picture", data=str(err))
 
@@ -1,59 +1,123 @@
 import urllib.parse, time, hashlib, base64
+from functools import lru_cache
 from app.core.config.env import get_settings
+from app.utils.cache.ttl_cache import TTLCache
 
 from cryptography.fernet import Fernet
 
 settings = get_settings()
 
 ENCRIPTION_SECRET_KEY = settings.ENCRIPTION_SECRET_KEY
+
+@lru_cache(maxsize=1)
+def _get_cipher_suite() -> Fernet:
+	"""
+	Builds the Fernet cipher once and reuses it for every call.
+	"""
+	return Fernet(ENCRIPTION_SECRET_KEY)
+
 def encrypt_secret_key(secret_key: str) -> str:
 	"""
 	Encrypts the secret key using the encryption key.
 	"""
-	print(ENCRIPTION_SECRET_KEY)
 	try:
-		cipher_suite = Fernet(ENCRIPTION_SECRET_KEY)
-		encrypted_secret = cipher_suite.encrypt(secret_key.encode())  # Encode string to bytes
-		return encrypted_secret.decode()  # Convert bytes to string for storage
+		# Encode the string to bytes, and the token back to a string for storage
+		return _get_cipher_suite().encrypt(secret_key.encode()).decode()
 	except Exception as e:
 		raise ValueError(f"Encryption failed: {str(e)}")
 
+def encrypt_secret_keys(secret_keys) -> list:
+	"""
+	Encrypts several secret keys with a single cipher instance.
+	"""
+	try:
+		cipher_suite = _get_cipher_suite()
+		# Encode strings to bytes, and the tokens back to strings for storage
+		return [cipher_suite.encrypt(secret_key.encode()).decode() for secret_key in secret_keys]
+	except Exception as e:
+		raise ValueError(f"Encryption failed: {str(e)}")
+
+@lru_cache(maxsize=10000)
 def decrypt_secret_key(encrypted_secret: str) -> str:
 	"""
 	Decrypts the encrypted secret key using the encryption key.
+
+	A given ciphertext always decrypts to the same key, so results are memoized.
 	"""
 	try:
-		cipher_suite = Fernet(ENCRIPTION_SECRET_KEY)
+		cipher_suite = _get_cipher_suite()
 		decrypted_secret = cipher_suite.decrypt(encrypted_secret.encode())  # Convert string to bytes for decryption
 		return decrypted_secret.decode()  # Decode bytes to string
 	except Exception as e:
 		raise ValueError(f"Decryption failed: {str(e)}")
 
 
+# Signed URLs are reused for a while instead of being re-signed on every view
+SIGNED_URL_REUSE_SECONDS = 600
+signed_url_cache = TTLCache(ttl=SIGNED_URL_REUSE_SECONDS, maxsize=10000)
+
 def generate_secure_bunny_stream_url(LIBRARY_ID:str ,video_id: str, BUNNY_STREAM_SECURITY_KEY: str,expiry_seconds: int = 3600):
 	"""
 	Generates a correctly signed Bunny Stream URL using HEX SHA256.
+
+	URLs are cached for SIGNED_URL_REUSE_SECONDS when the expiry leaves them
+	valid well past that window.
 	"""
 	# print(ENCRIPTED_SECURITY_KEY)
 	# try:
 	# 	BUNNY_STREAM_SECURITY_KEY = decrypt_secret_key(ENCRIPTED_SECURITY_KEY)
 	# except Exception as e:
 	# 	raise e
-	if not BUNNY_STREAM_SECURITY_KEY:
-		return "https://iframe.mediadelivery.net/embed/{LIBRARY_ID}/{video_id}"
+	if expiry_seconds < 2 * SIGNED_URL_REUSE_SECONDS:
+		return generate_secure_bunny_stream_urls(LIBRARY_ID, [video_id], BUNNY_STREAM_SECURITY_KEY, expiry_seconds)[0]
 
-	expiry_time = int(time.time()) + expiry_seconds  # Expiry timestamp
-	token_string = BUNNY_STREAM_SECURITY_KEY + video_id + str(expiry_time)
+	cache_key = (LIBRARY_ID, video_id, BUNNY_STREAM_SECURITY_KEY, expiry_seconds)
+	url = signed_url_cache.get(cache_key)
+	if url is None:
+		url = generate_secure_bunny_stream_urls(LIBRARY_ID, [video_id], BUNNY_STREAM_SECURITY_KEY, expiry_seconds)[0]
+		signed_url_cache.set(cache_key, url)
+	return url
 
-	# Generate the correct HEX SHA256 hash
-	try:
-		token_hash = hashlib.sha256(token_string.encode('utf-8')).hexdigest()
-	except Exception as e:
-		raise e
+def generate_secure_bunny_stream_url_for_encrypted_key(LIBRARY_ID: str, video_id: str, encrypted_key: str, expiry_seconds: int = 3600):
+	"""
+	Generates a signed Bunny Stream URL from the key as stored in the database.
+
+	The cache is keyed on the stored ciphertext, so a cached URL is returned
+	without decrypting the key at all. Raises ValueError if decryption fails.
+	"""
+	if expiry_seconds < 2 * SIGNED_URL_REUSE_SECONDS:
+		return generate_secure_bunny_stream_url(LIBRARY_ID, video_id, decrypt_secret_key(encrypted_key), expiry_seconds)
 
-	# Construct the secure URL
-	secure_url = f"https://iframe.mediadelivery.net/embed/{LIBRARY_ID}/{video_id}?token={token_hash}&expires={expiry_time}"
-	return secure_url
+	cache_key = ("encrypted", LIBRARY_ID, video_id, encrypted_key, expiry_seconds)
+	url = signed_url_cache.get(cache_key)
+	if url is None:
+		url = generate_secure_bunny_stream_urls(LIBRARY_ID, [video_id], decrypt_secret_key(encrypted_key), expiry_seconds)[0]
+		signed_url_cache.set(cache_key, url)
+	return url
+
+
+def generate_secure_bunny_stream_urls(LIBRARY_ID: str, video_ids, BUNNY_STREAM_SECURITY_KEY: str, expiry_seconds: int = 3600):
+	"""
+	Generates signed Bunny Stream URLs for several videos of the same library.
+
+	The token is sha256(security_key + video_id + expires), so the security key
+	prefix is hashed once and the digest state is copied for every video.
+	"""
+	if not BUNNY_STREAM_SECURITY_KEY:
+		return [f"https://iframe.mediadelivery.net/embed/{LIBRARY_ID}/{video_id}" for video_id in video_ids]
+
+	expiry_time = str(int(time.time()) + expiry_seconds)  # Expiry timestamp
+	expiry_bytes = expiry_time.encode('utf-8')
+	key_state = hashlib.sha256(BUNNY_STREAM_SECURITY_KEY.encode('utf-8'))
+
+	secure_urls = []
+	for video_id in video_ids:
+		# Generate the correct HEX SHA256 hash
+		token = key_state.copy()
+		token.update(video_id.encode('utf-8'))
+		token.update(expiry_bytes)
+		secure_urls.append(f"https://iframe.mediadelivery.net/embed/{LIBRARY_ID}/{video_id}?token={token.hexdigest()}&expires={expiry_time}")
+	return secure_urls
 
 
 VERSION = "2"
@@ -1,8 +1,50 @@
 import os
 import requests
+from requests.adapters import HTTPAdapter
+import httpx
 import uuid
 import re
 from pathlib import Path
+import logging
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+NON_WORD_PATTERN = re.compile(r'[^\w]')
+
+# Shared across requests so uploads reuse pooled keep-alive connections
+_async_client = None
+_session = None
+
+def get_session() -> requests.Session:
+    global _session
+    if _session is None:
+        _session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=20, pool_maxsize=100, pool_block=False)
+        _session.mount("https://", adapter)
+    return _session
+
+def get_async_client() -> httpx.AsyncClient:
+    global _async_client
+    if _async_client is None:
+        _async_client = httpx.AsyncClient(
+            # keep idle connections longer than httpx's 5s default so upload
+            # bursts a few seconds apart skip the TLS handshake
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=60.0),
+            timeout=httpx.Timeout(30.0)
+        )
+    return _async_client
+
+async def close_async_client():
+    global _async_client
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
+
+async def _iter_upload(upload):
+    """Yield an UploadFile's content in UPLOAD_CHUNK_SIZE pieces."""
+    while chunk := await upload.read(UPLOAD_CHUNK_SIZE):
+        yield chunk
 
 
 class BunnyCDNStorage:
@@ -23,8 +65,7 @@ class BunnyCDNStorage:
         file_name     = file_url.split("/")[-1]
         download_path = Path(destination_path, file_name)
 
-        print(f"Attempting to download from: {file_url}")
-        print(f"Will save to: {download_path}")
+        logger.debug("Downloading %s to %s", file_url, download_path)
 
         try:
             headers = {
@@ -32,17 +73,13 @@ class BunnyCDNStorage:
                 'accept': '*/*'
             }
 
-            print(f"Using headers: {headers}")
-
             # Set a timeout to avoid hanging indefinitely
-            response = requests.get(file_url, headers=headers, stream=True, timeout=10)
+            response = get_session().get(file_url, headers=headers, stream=True, timeout=10)
 
-            # Print response status and headers for debugging
-            print(f"Response status: {response.status_code}")
-            print(f"Response headers: {response.headers}")
+            logger.debug("Download response status %s", response.status_code)
 
             if response.status_code != 200:
-                print(f"Error response content: {response.text}")
+                logger.warning("Download of %s failed: %s", file_url, response.text)
                 return response.status_code
 
             response.raise_for_status()
@@ -56,48 +93,50 @@ class BunnyCDNStorage:
                     if chunk:
                         f.write(chunk)
 
-            print(f"File downloaded successfully to {download_path}")
+            logger.debug("Downloaded %s", download_path)
             return response.status_code
         except requests.exceptions.Timeout:
-            print("Request timed out. The server may be unavailable or the file may be too large.")
+            logger.warning("Download of %s timed out", file_url)
             return "Timeout Error"
         except requests.exceptions.HTTPError as http_err:
-            print(f"HTTP Error: {http_err}")
+            logger.warning("Download of %s failed: %s", file_url, http_err)
             return http_err
         except Exception as error:
-            print(f"Error downloading file: {error}")
+            logger.warning("Download of %s failed: %s", file_url, error)
             return error
 
     def upload_file(self, storage_path, file_path, file_name=None):
         try:
             # Get the original file name and extension
             original_file = Path(file_path)
-            original_name = original_file.name
-            original_extension = original_file.suffix
 
             # If file_name is not provided, use the original name
             if file_name is None:
-                file_name = original_name
-            else:
-                # Check if the provided file_name has an extension
-                file_name_path = Path(file_name)
-                file_name_extension = file_name_path.suffix
+                file_name = original_file.name
 
-                # If the provided file_name doesn't have an extension, add the original extension
-                if not file_name_extension and original_extension:
-                    file_name = f"{file_name}{original_extension}"
+            with open(file_path, 'rb') as file_data:
+                return self.upload_stream(storage_path, file_data, file_name, original_file.suffix)
+        except Exception as error:
+            return error
 
-            # Make the filename unique by adding a UUID
-            # First, separate the name and extension
-            file_name_without_ext, file_ext = os.path.splitext(file_name)
+    def upload_stream(self, storage_path, file_obj, file_name, extension=""):
+        """
+        Upload a file-like object without buffering it in memory.
 
-            # Clean the name (remove spaces, special chars)
-            file_name_without_ext = re.sub(r'[^\w]', '_', file_name_without_ext).lower()
+        requests sends the body straight from `file_obj` in chunks, so an
+        UploadFile's spooled file can be passed as is.
 
-            # Add a unique identifier
-            unique_id = str(uuid.uuid4())[:8]
-            file_name = f"{file_name_without_ext}_{unique_id}{file_ext}"
+        Args:
+            storage_path: Folder inside the storage zone ("" for the root).
+            file_obj: Readable binary file-like object, positioned at the start.
+            file_name: Base name for the stored file; made unique here.
+            extension: Extension to add when file_name has none (e.g. ".png").
 
+        Returns:
+            str: The CDN URL of the uploaded file, or the exception on failure.
+        """
+        try:
+            file_name = self._unique_file_name(file_name, extension)
             storage_url = f'{self.base_url}{storage_path}{file_name}'
 
             headers = {
@@ -106,8 +145,7 @@ class BunnyCDNStorage:
                 'Accept': 'application/json'
             }
 
-            with open(file_path, 'rb') as file_data:
-                response = requests.put(storage_url, headers=headers, data=file_data)
+            response = get_session().put(storage_url, headers=headers, data=file_obj)
 
             response.raise_for_status()
             cdn_url = f'https://{self.pull_zone}.b-cdn.net/{storage_path}{file_name}'
@@ -115,15 +153,66 @@ class BunnyCDNStorage:
         except Exception as error:
             return error
 
+    async def upload_stream_async(self, storage_path, upload, file_name, extension=""):
+        """
+        Upload an UploadFile without blocking the event loop.
+
+        The body is read from `upload` chunk by chunk and sent over the shared
+        httpx.AsyncClient.
+
+        Args:
+            storage_path: Folder inside the storage zone ("" for the root).
+            upload: The UploadFile to send, positioned at the start.
+            file_name: Base name for the stored file; made unique here.
+            extension: Extension to add when file_name has none (e.g. ".png").
+
+        Returns:
+            str: The CDN URL of the uploaded file.
+
+        Raises:
+            httpx.HTTPError: If the upload fails.
+        """
+        file_name = self._unique_file_name(file_name, extension)
+        storage_url = f'{self.base_url}{storage_path}{file_name}'
+
+        headers = {
+            'AccessKey': self.apikey,
+            'Content-Type': 'application/octet-stream',
+            'Accept': 'application/json'
+        }
+        if upload.size is not None:
+            headers['Content-Length'] = str(upload.size)
+
+        response = await get_async_client().put(storage_url, headers=headers, content=_iter_upload(upload))
+        response.raise_for_status()
+        return f'https://{self.pull_zone}.b-cdn.net/{storage_path}{file_name}'
+
+    @staticmethod
+    def _unique_file_name(file_name, extension=""):
+        # If the provided file_name doesn't have an extension, add the original extension
+        if not Path(file_name).suffix and extension:
+            file_name = f"{file_name}{extension}"
+
+        # Make the filename unique by adding a UUID
+        # First, separate the name and extension
+        file_name_without_ext, file_ext = os.path.splitext(file_name)
+
+        # Clean the name (remove spaces, special chars)
+        file_name_without_ext = NON_WORD_PATTERN.sub('_', file_name_without_ext).lower()
+
+        # Add a unique identifier
+        unique_id = str(uuid.uuid4())[:8]
+        return f"{file_name_without_ext}_{unique_id}{file_ext}"
+
     def object_exists(self, file_path):
         file_url = f'{ self.base_url }{ file_path }'
-        response = requests.get(file_url, headers=self.headers)
+        response = get_session().get(file_url, headers=self.headers)
         return response.status_code == 200
 
     def delete_object(self, file_path):
         try:
             file_url = f'{ self.base_url }{ file_path }'
-            response = requests.delete(file_url, headers=self.headers)
+            response = get_session().delete(file_url, headers=self.headers)
             response.raise_for_status()
             return response.status_code
         except Exception as error:
@@ -0,0 +1,72 @@
+import time
+from threading import Lock
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """
+    Small thread-safe in-process cache whose entries expire after `ttl` seconds.
+
+    Each worker process keeps its own copy, so it is only meant for values
+    where a few seconds of staleness is acceptable.
+    """
+
+    def __init__(self, ttl: float, maxsize: int = 1024):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data = {}
+        self._lock = Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return default
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            if key not in self._data and len(self._data) >= self.maxsize:
+                self._evict()
+            self._data[key] = (time.monotonic() + self.ttl, value)
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Tuple[Any, Optional[Exception]]]):
+        """
+        Return a cached `(value, None)` or call a repository-style loader.
+
+        Args:
+            key: The cache key.
+            loader: Callable returning a `(result, err)` tuple; only results
+                without an error are cached.
+
+        Returns:
+            Tuple[Any, Optional[Exception]]: The value and error, like the loader.
+        """
+        missing = object()
+        value = self.get(key, missing)
+        if value is not missing:
+            return value, None
+        value, err = loader()
+        if err is None:
+            self.set(key, value)
+        return value, err
+
+    def _evict(self) -> None:
+        # Drop expired entries first, then the oldest ones if still full
+        now = time.monotonic()
+        for key in [k for k, (expires_at, _) in self._data.items() if expires_at < now]:
+            del self._data[key]
+        while len(self._data) >= self.maxsize:
+            del self._data[next(iter(self._data))]
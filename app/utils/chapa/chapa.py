@@ -1,18 +1,33 @@
 import requests
+from requests.adapters import HTTPAdapter
 from chapa import Chapa
 from app.core.config.env import get_settings
 import random
 import string
+import logging
+
+logger = logging.getLogger(__name__)
 settings = get_settings()
 # Replace 'your_secret_key' with your actual Chapa secret key
 
+CHAPA_TIMEOUT_SECONDS = 10
+
+# Shared across requests so Chapa calls reuse pooled keep-alive connections
+_session = None
+
+def get_session() -> requests.Session:
+    global _session
+    if _session is None:
+        _session = requests.Session()
+        _session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=20))
+    return _session
+
 def generete_tx_ref(length):
     #Generate a transaction reference
     tx_ref = string.ascii_lowercase
     return ''.join(random.choice(tx_ref) for i in range(length))
 
 def pay_course(payment_data):
-    print(payment_data.title)
     data = {
         # Required fields
         'phone_number': payment_data.phone_number,  # Use attribute-style access
@@ -36,10 +51,11 @@ def pay_course(payment_data):
         'Content-Type': 'application/json'
     }
 
-    response = requests.post(
+    response = get_session().post(
         'https://api.chapa.co/v1/transaction/initialize',
         json=data,
-        headers=headers
+        headers=headers,
+        timeout=CHAPA_TIMEOUT_SECONDS
     )
     
     return response.json()
@@ -51,7 +67,7 @@ def verify_payment(transaction_id):
 	headers = {
 		'Authorization': f'Bearer {settings.CHAPA_SECRET_KEY}'
 	}
-	response = requests.get(url, headers=headers, data=payload)
-	print("verification response",response)
+	response = get_session().get(url, headers=headers, data=payload, timeout=CHAPA_TIMEOUT_SECONDS)
+	logger.debug("Chapa verification status %s", response.status_code)
 	data = response.json()
-	return data
\ No newline at end of file
+	return data
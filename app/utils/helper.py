@@ -1,11 +1,88 @@
 import re
+import json
+import base64
+from datetime import datetime
+from uuid import UUID
+from typing import Optional
+from fastapi.responses import JSONResponse
+from pydantic_core import to_json
+from app.utils.exceptions.exceptions import ValidationError
+
+PHONE_PREFIX_PATTERN = re.compile(r'^(?:\+251|251|0)')
 
 def normalize_phone_number(phone: str) -> str:
     # Strip +251, 251, or 0 at the start
-    return re.sub(r'^(?:\+251|251|0)', '', phone)
+    return PHONE_PREFIX_PATTERN.sub('', phone)
 
 def format_phone_for_sending(phone: str, use_plus_prefix=True) -> str:
     if use_plus_prefix:
         return f'+251{normalize_phone_number(phone)}'
     else:
-        return f'0{normalize_phone_number(phone)}'
\ No newline at end of file
+        return f'0{normalize_phone_number(phone)}'
+
+def encode_cursor(created_at: datetime, row_id) -> str:
+    # Opaque keyset cursor built from the last row of a page
+    payload = json.dumps([created_at.isoformat(), str(row_id)])
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+def decode_cursor(cursor: str):
+    # Returns (created_at, id) or raises ValueError on a malformed cursor
+    try:
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(created_at), UUID(row_id)
+    except Exception as e:
+        raise ValueError("Invalid cursor") from e
+
+def parse_cursor(cursor: Optional[str]):
+    # decode_cursor for request input: None without a cursor, and a
+    # ValidationError clients see for a malformed one
+    if not cursor:
+        return None
+    try:
+        return decode_cursor(cursor)
+    except ValueError:
+        raise ValidationError(detail="Invalid pagination cursor")
+
+def split_page(rows, page_size: int, cursor_of):
+    """
+    Split rows fetched with one look-ahead row past page_size.
+
+    Paginated repository queries fetch page_size + 1 rows; the extra row only
+    tells whether another page exists and is dropped here.
+
+    Args:
+        rows: The fetched rows.
+        page_size (int): The number of rows per page.
+        cursor_of: Returns the (timestamp, id) a row's cursor is built from.
+
+    Returns:
+        tuple: The page rows, whether another page follows, and the cursor of
+            the next page or None.
+    """
+    page = rows[:page_size]
+    has_more = len(rows) > page_size
+    next_cursor = encode_cursor(*cursor_of(page[-1])) if has_more else None
+    return page, has_more, next_cursor
+
+def as_uuid(value) -> UUID:
+    # Primary keys are stored as UUID objects; Session.get only finds an
+    # already-loaded row when the key has the same type. Raises ValueError.
+    return value if isinstance(value, UUID) else UUID(str(value))
+
+def construct_from_orm(model, obj, **values):
+    """
+    Build a response model from an ORM object loaded from our own database.
+
+    The row has already been validated on the way in, so model_construct skips
+    pydantic's validation; nested models must be passed in `values` already built.
+    Only use this for database rows, never for client input.
+    """
+    for name in model.model_fields:
+        if name not in values:
+            values[name] = getattr(obj, name)
+    return model.model_construct(**values)
+
+class PydanticJSONResponse(JSONResponse):
+    # pydantic-core encodes models, UUIDs and datetimes natively in Rust
+    def render(self, content) -> bytes:
+        return to_json(content)
@@ -14,6 +14,17 @@ async def is_logged_in(request: Request):
 
     return user_data # Return decoded user info
 
+async def get_optional_user(request: Request):
+    """Like is_logged_in, but returns None instead of raising when there is no usable token."""
+    token = request.headers.get("Authorization")
+    if not token or not token.startswith("Bearer "):
+        return None
+    try:
+        return verify_access_token(token.split(" ")[1])
+    except HTTPException:
+        # an expired or bad token on a public endpoint is treated as anonymous
+        return None
+
 async def is_admin(request: Request):
     decoded_token = await is_logged_in(request)
 
@@ -1,5 +1,8 @@
 import requests  
 from app.core.config.env import get_settings
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 setting = get_settings()
@@ -33,7 +36,7 @@ def send_otp_sms(phone_number: str):
         result = session.get(url, headers=headers)
     except requests.exceptions.RequestException as e:
         # Handle the exception (e.g., log it, raise a custom error, etc.)
-        print(f"Request failed: {e}")
+        logger.warning("SMS request failed: %s", e)
         return (500, str(e))
     # check result
     status_code = 200
@@ -69,7 +72,7 @@ def verify_otp_sms(phone_number: str, code: str):
         result = session.get(url, headers=headers)
     except requests.exceptions.RequestException as e:
         # Handle the exception (e.g., log it, raise a custom error, etc.)
-        print(f"Request failed: {e}")
+        logger.warning("SMS request failed: %s", e)
         return (500, str(e))
     # check result
     status_code = 200
@@ -103,7 +106,7 @@ def send_sms(phone_number: str, message: str):
         result = session.get(url, headers=headers)
     except requests.exceptions.RequestException as e:
         # Handle the exception (e.g., log it, raise a custom error, etc.)
-        print(f"Request failed: {e}")
+        logger.warning("SMS request failed: %s", e)
         return (500, str(e))
     
     return (result.status_code, result.content)
@@ -0,0 +1,14 @@
+from functools import lru_cache
+from pydantic import TypeAdapter
+
+
+@lru_cache(maxsize=128)
+def ta(tp) -> TypeAdapter:
+    """
+    Return a shared TypeAdapter for `tp`.
+
+    Building an adapter compiles its validator and serializer, so each type
+    gets one for the life of the process. Use it for types without their own
+    validator, such as `List[Model]`, to validate a whole list in one call.
+    """
+    return TypeAdapter(tp)
@@ -0,0 +1,129 @@
+"""
+Shared fixtures for the query-count regression tests.
+
+The tests run against the database in DATABASE_URL (read from the
+environment or .env like the app itself). Every test runs inside a
+transaction that is rolled back afterwards, so nothing it writes is kept.
+"""
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+from app.core.config.database import Base, SessionLocal, engine
+from app.domain.model.user import User
+from app.domain.model.course import Course, Enrollment, Lesson, Video
+from app.service.courseService import count_cache, analysis_cache
+from app.service.lesson_service import course_cache, lesson_access_cache
+from app.service.userService import role_cache, owner_cache
+
+
+@contextmanager
+def count_queries(session):
+    """
+    Collect the SQL statements a session runs inside the block.
+
+        with count_queries(db) as statements:
+            service.getEnrolledCourses(user_id, page_size=50)
+        assert len(statements) <= 3
+    """
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    connection = session.connection()
+    event.listen(connection, "before_cursor_execute", _record)
+    try:
+        yield statements
+    finally:
+        event.remove(connection, "before_cursor_execute", _record)
+
+
+def _raise_on_lazy_load(orm_execute_state):
+    # A lazy load is the N+1 these tests guard against; fail on the spot
+    # instead of only showing up as a higher statement count
+    if orm_execute_state.lazy_loaded_from is not None:
+        raise AssertionError(
+            f"lazy load from {orm_execute_state.lazy_loaded_from.class_.__name__}: "
+            f"{orm_execute_state.statement}"
+        )
+
+
+@pytest.fixture(scope="session", autouse=True)
+def tables():
+    Base.metadata.create_all(bind=engine)
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    # In-process caches would otherwise skip queries the tests mean to count
+    for cache in (count_cache, analysis_cache, course_cache, lesson_access_cache, role_cache, owner_cache):
+        cache.clear()
+    yield
+
+
+@pytest.fixture
+def db():
+    """A session whose commits only release savepoints of a rolled-back transaction."""
+    connection = engine.connect()
+    transaction = connection.begin()
+    session = SessionLocal(bind=connection, join_transaction_mode="create_savepoint")
+    event.listen(session, "do_orm_execute", _raise_on_lazy_load)
+    try:
+        yield session
+    finally:
+        session.close()
+        transaction.rollback()
+        connection.close()
+
+
+def _user(db, phone_number, role):
+    user = User(
+        password="not-a-real-hash",
+        first_name="Test",
+        last_name=role.title(),
+        phone_number=phone_number,
+        role=role,
+        is_active=True,
+    )
+    db.add(user)
+    return user
+
+
+@pytest.fixture
+def catalog(db):
+    """
+    An instructor with 60 courses of two lessons each, a student enrolled
+    in all of them, and 60 more students enrolled in the first course.
+    """
+    instructor = _user(db, "900000001", "instructor")
+    student = _user(db, "900000002", "user")
+    classmates = [_user(db, f"9100{number:05d}", "user") for number in range(60)]
+    db.flush()
+
+    courses = []
+    for number in range(60):
+        course = Course(
+            title=f"Course {number}",
+            description="Query count fixture",
+            tags=["test"],
+            price=100.0,
+            discount=10.0,
+            instructor_id=instructor.id,
+        )
+        for order in (1, 2):
+            lesson = Lesson(title=f"Lesson {order}", description="Lesson", duration=10, order=order)
+            lesson.video = Video(video_id="video", library_id="library", secret_key="secret")
+            course.lessons.append(lesson)
+        courses.append(course)
+    db.add_all(courses)
+    db.flush()
+
+    db.add_all(Enrollment(user_id=student.id, course_id=course.id) for course in courses)
+    db.add_all(Enrollment(user_id=classmate.id, course_id=courses[0].id) for classmate in classmates)
+    ids = {"instructor": instructor.id, "student": student.id, "course": courses[0].id}
+    db.commit()
+    # start every test from an empty identity map, like a fresh request
+    db.expunge_all()
+    return ids
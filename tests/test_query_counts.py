@@ -0,0 +1,91 @@
+"""
+Statement budgets for the list endpoints.
+
+A page has to cost the same handful of statements whatever its size; a
+relationship that slips back to lazy loading fails these tests outright
+(see `_raise_on_lazy_load` in conftest).
+"""
+from app.service.courseService import CourseService
+from conftest import count_queries
+
+PAGE_SIZE = 50
+MAX_STATEMENTS = 3
+
+
+def test_enrolled_courses_page(db, catalog):
+    service = CourseService(db)
+
+    with count_queries(db) as statements:
+        result = service.getEnrolledCourses(catalog["student"], page_size=PAGE_SIZE)
+
+    assert len(result["data"]) == PAGE_SIZE
+    assert result["pagination"]["has_more"]
+    assert len(statements) <= MAX_STATEMENTS
+
+
+def test_enrolled_courses_with_total(db, catalog):
+    service = CourseService(db)
+
+    with count_queries(db) as statements:
+        result = service.getEnrolledCourses(catalog["student"], page_size=PAGE_SIZE, include_total=True)
+
+    assert result["pagination"]["total_items"] == 60
+    assert len(statements) <= MAX_STATEMENTS
+
+
+def test_enrolled_courses_cursor_page(db, catalog):
+    service = CourseService(db)
+    first = service.getEnrolledCourses(catalog["student"], page_size=PAGE_SIZE)
+
+    with count_queries(db) as statements:
+        result = service.getEnrolledCourses(
+            catalog["student"], page_size=PAGE_SIZE, cursor=first["pagination"]["next_cursor"]
+        )
+
+    assert len(result["data"]) == 10
+    assert not result["pagination"]["has_more"]
+    assert len(statements) <= MAX_STATEMENTS
+
+
+def test_courses_page(db, catalog):
+    service = CourseService(db)
+
+    with count_queries(db) as statements:
+        result = service.getCourses(page=1, page_size=PAGE_SIZE)
+
+    assert len(result["data"]) == PAGE_SIZE
+    assert len(statements) <= MAX_STATEMENTS
+
+
+def test_courses_page_for_user(db, catalog):
+    service = CourseService(db)
+
+    with count_queries(db) as statements:
+        result = service.getCourses(page=1, page_size=PAGE_SIZE, user_id=catalog["student"])
+
+    assert len(result["data"]) == PAGE_SIZE
+    assert len(statements) <= MAX_STATEMENTS
+
+
+def test_courses_cursor_page(db, catalog):
+    service = CourseService(db)
+    first = service.getCourses(page=1, page_size=PAGE_SIZE)
+
+    with count_queries(db) as statements:
+        result = service.getCourses(page_size=PAGE_SIZE, cursor=first["pagination"]["next_cursor"])
+
+    assert len(result["data"]) == 10
+    assert len(statements) <= MAX_STATEMENTS
+
+
+def test_enrolled_users_page(db, catalog):
+    service = CourseService(db)
+
+    with count_queries(db) as statements:
+        result = service.getEnrolledUsers(
+            catalog["course"], catalog["instructor"], page=1, page_size=PAGE_SIZE
+        )
+
+    assert len(result["data"]) == PAGE_SIZE
+    assert result["pagination"]["has_more"]
+    assert len(statements) <= MAX_STATEMENTS